@@ -10,24 +10,17 @@ import sys
 import os
 import signal
 import argparse
-import time
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, TYPE_CHECKING
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-# Core imports
-from utils.production_logger import setup_production_logging, get_production_logger
-from utils.error_recovery import setup_error_recovery, get_recovery_manager, handle_error, ErrorSeverity
-from monitoring.resource_monitor import setup_resource_monitor, get_resource_monitor
-from security.encryption import setup_security, get_security_manager
-from utils.backup_manager import setup_backup_manager, get_backup_manager
-
-# Mining imports
-from core.miner import AdvancedMiner
-from terminal_gui import start_terminal_gui
-from utils.logger import get_logger
+# Subsystems are imported inside the functions that use them, so single-purpose
+# runs (--terminal, --benchmark) don't pay for loading the production stack
+if TYPE_CHECKING:
+    from core.miner import AdvancedMiner
 
 # Global production components
 logger = None
@@ -117,6 +110,12 @@ def initialize_production_systems(config: Dict[str, Any]) -> bool:
     global logger, production_logger, recovery_manager, resource_monitor, security_manager, backup_manager
     
     try:
+        from utils.production_logger import setup_production_logging, get_production_logger
+        from utils.error_recovery import setup_error_recovery
+        from monitoring.resource_monitor import setup_resource_monitor
+        from security.encryption import setup_security
+        from utils.backup_manager import setup_backup_manager
+        
         # Setup production logging
         logging_config = config.get("logging", {})
         production_logger = setup_production_logging(logging_config)
@@ -172,7 +171,7 @@ def initialize_basic_systems(config: Dict[str, Any]) -> bool:
         return False
 
 
-def start_mining_with_monitoring(config: Dict[str, Any]) -> Optional[AdvancedMiner]:
+def start_mining_with_monitoring(config: Dict[str, Any]) -> Optional["AdvancedMiner"]:
     """Start mining with full production monitoring"""
     global logger, recovery_manager, resource_monitor, backup_manager
     
@@ -180,6 +179,7 @@ def start_mining_with_monitoring(config: Dict[str, Any]) -> Optional[AdvancedMin
         logger.log_info("Starting mining with production monitoring", component="main")
         
         # Create miner instance
+        from core.miner import AdvancedMiner
         miner = AdvancedMiner(config)
         
         # Register recovery actions
@@ -217,10 +217,17 @@ def start_mining_with_monitoring(config: Dict[str, Any]) -> Optional[AdvancedMin
         return miner
         
     except Exception as e:
-        handle_error("mining", e, ErrorSeverity.CRITICAL)
+        report_critical_error("mining", e)
         return None
 
 
+def report_critical_error(component: str, error: Exception):
+    """Forward a critical error to the recovery manager, if one is running"""
+    if recovery_manager:
+        from utils.error_recovery import handle_error, ErrorSeverity
+        handle_error(component, error, ErrorSeverity.CRITICAL)
+
+
 def main():
     """Main application entry point"""
     global logger, production_logger, recovery_manager, resource_monitor, backup_manager
@@ -286,6 +293,7 @@ def main():
             print("Starting terminal GUI")
             try:
                 print("DEBUG: Calling start_terminal_gui...")
+                from terminal_gui import start_terminal_gui
                 start_terminal_gui(miner_instance=None, config=config)
                 print("DEBUG: Terminal GUI completed")
             except Exception as e:
@@ -307,21 +315,26 @@ def main():
             miner = start_mining_with_monitoring(config)
             
             if miner:
+                # The loop below owns cleanup, so signals only need to wake it
+                shutdown_event = threading.Event()
+                signal.signal(signal.SIGINT, lambda signum, frame: shutdown_event.set())
+                signal.signal(signal.SIGTERM, lambda signum, frame: shutdown_event.set())
+                
                 try:
-                    # Main mining loop
-                    while True:
-                        time.sleep(60)  # Check every minute
-                        
-                        # Log periodic status
+                    # Main mining loop: log status every minute until shutdown
+                    while not shutdown_event.wait(60):
                         stats = resource_monitor.get_stats()
                         if stats:
+                            current_metrics = stats.get("current_metrics") or {}
                             logger.log_performance(
                                 "mining_status",
                                 1,
                                 "running",
-                                cpu_percent=stats.get("current_metrics", {}).get("cpu_percent", 0),
-                                memory_percent=stats.get("current_metrics", {}).get("memory_percent", 0)
+                                cpu_percent=current_metrics.get("cpu_percent", 0),
+                                memory_percent=current_metrics.get("memory_percent", 0)
                             )
+                    
+                    logger.log_info("Mining stopped by shutdown signal", component="main")
                         
                 except KeyboardInterrupt:
                     logger.log_info("Mining stopped by user", component="main")
@@ -342,7 +355,7 @@ def main():
                 return 1
     
     except Exception as e:
-        handle_error("main", e, ErrorSeverity.CRITICAL)
+        report_critical_error("main", e)
         return 1
     
     finally:
@@ -5,24 +5,54 @@ Foundation for all mining algorithms
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
+import itertools
+import os
 import time
 import threading
 
 
+MAX_HASH = 2**256 - 1
+
+# Shared by every algorithm instance, so each mining thread that pins
+# itself takes the next CPU from the affine_to_cpu list
+_affinity_slots = itertools.count()
+
+
+def target_to_bytes(target: int) -> bytes:
+    """
+    Encode a target as 32 big-endian bytes, clamped to the 256-bit range
+    
+    Raw digests compare against the result with a plain bytes comparison,
+    which orders the same way as the big-endian integers.
+    """
+    return max(0, min(target, MAX_HASH)).to_bytes(32, "big")
+
+
 class BaseAlgorithm(ABC):
-    """Base class for all mining algorithms"""
+    """
+    Base class for all mining algorithms
+    
+    Performance tracking is lock-free: each mining thread only writes its
+    own hash counter slot, single dict stores are atomic, and
+    get_performance reads each field once into a snapshot of copies.
+    """
     
     def __init__(self, name: str, config: Dict[str, Any]):
         self.name = name
         self.config = config
         self.running = False
         self.start_time = 0
-        self.total_hashes = 0
         self.performance_data = {}
-        self._lock = threading.Lock()
+        # Hash counts are kept per mining thread: each slot has a single
+        # writer, so counting needs no lock and threads never contend
+        self._hash_counts: Dict[int, int] = {}
         
         # Algorithm-specific initialization
         self._initialize()
+        
+        # Low power mode trades hashrate for shorter, cooler batches
+        if self.config.get("low_power_mode", False) and hasattr(self, "batch_size"):
+            self.batch_size = max(1, self.batch_size // 2)
     
     @abstractmethod
     def _initialize(self):
@@ -45,8 +75,9 @@ class BaseAlgorithm(ABC):
     def start(self):
         """Start the algorithm"""
         self.running = True
-        self.start_time = time.time()
-        self.total_hashes = 0
+        self.start_time = time.monotonic()
+        self._hash_counts.clear()
+        self._apply_affinity()
         self._on_start()
     
     def stop(self):
@@ -54,6 +85,38 @@ class BaseAlgorithm(ABC):
         self.running = False
         self._on_stop()
     
+    def _apply_affinity(self):
+        """
+        Pin the calling mining thread to a CPU from the affine_to_cpu setting
+        
+        Accepts a single CPU index or a list; successive mining threads are
+        assigned CPUs from the list round-robin. Anything else, including a
+        bool, raises ValueError. Platforms without sched_setaffinity (macOS,
+        Windows) leave scheduling to the OS.
+        """
+        cpus = self.config.get("affine_to_cpu")
+        if cpus is None:
+            return
+        if isinstance(cpus, int) and not isinstance(cpus, bool):
+            cpus = [cpus]
+        if (not isinstance(cpus, (list, tuple))
+                or any(isinstance(cpu, bool) or not isinstance(cpu, int) for cpu in cpus)):
+            raise ValueError(f"affine_to_cpu must be a CPU index or a list of them, got {cpus!r}")
+        if not cpus:
+            return
+        
+        if not hasattr(os, "sched_setaffinity"):
+            self.update_performance_data("cpu_affinity", "unsupported")
+            return
+        
+        cpu = cpus[next(_affinity_slots) % len(cpus)]
+        try:
+            # pid 0 targets the calling thread only
+            os.sched_setaffinity(0, {cpu})
+            self.update_performance_data("cpu_affinity", cpu)
+        except (OSError, ValueError):
+            self.update_performance_data("cpu_affinity", None)
+    
     def _on_start(self):
         """Called when algorithm starts"""
         pass
@@ -63,28 +126,37 @@ class BaseAlgorithm(ABC):
         pass
     
     def record_hash(self, count: int = 1):
-        """Record hash attempts"""
-        with self._lock:
-            self.total_hashes += count
+        """Record hash attempts in the calling thread's counter slot"""
+        counts = self._hash_counts
+        thread_id = threading.get_ident()
+        counts[thread_id] = counts.get(thread_id, 0) + count
+    
+    @property
+    def total_hashes(self) -> int:
+        """Total hash attempts across all mining threads"""
+        return sum(self._hash_counts.copy().values())
     
     def get_performance(self) -> Dict[str, Any]:
         """Get performance metrics"""
-        with self._lock:
-            uptime = time.time() - self.start_time if self.start_time > 0 else 0
-            hashrate = self.total_hashes / uptime if uptime > 0 else 0
-            
-            return {
-                "hashrate": hashrate,
-                "total_hashes": self.total_hashes,
-                "uptime": uptime,
-                "algorithm_type": self.get_algorithm_type(),
-                "custom_data": self.performance_data
-            }
+        now = time.monotonic()
+        start_time = self.start_time
+        total_hashes = self.total_hashes
+        custom_data = self.performance_data.copy()
+        
+        uptime = max(0.0, now - start_time) if start_time > 0 else 0
+        hashrate = total_hashes / uptime if uptime > 0 else 0
+        
+        return {
+            "hashrate": hashrate,
+            "total_hashes": total_hashes,
+            "uptime": uptime,
+            "algorithm_type": self.get_algorithm_type(),
+            "custom_data": custom_data
+        }
     
     def update_performance_data(self, key: str, value: Any):
         """Update algorithm-specific performance data"""
-        with self._lock:
-            self.performance_data[key] = value
+        self.performance_data[key] = value
     
     @property
     def algorithm_type(self) -> str:
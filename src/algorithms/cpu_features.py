@@ -0,0 +1,64 @@
+"""
+CPU Feature Detection
+Reports the hashing-related instruction set extensions of the host CPU
+"""
+
+import platform
+from functools import lru_cache
+from typing import FrozenSet
+
+try:
+    import cpuinfo
+    CPUINFO_AVAILABLE = True
+except ImportError:
+    CPUINFO_AVAILABLE = False
+
+
+# Flag names used by /proc/cpuinfo and py-cpuinfo for SHA-256 instructions
+_SHA_FLAGS = frozenset({"sha_ni", "sha"})
+# ARMv8 Crypto Extensions (sha256h/sha256h2/sha256su0/sha256su1)
+_ARM_SHA_FLAGS = frozenset({"sha2"})
+
+
+@lru_cache(maxsize=1)
+def get_cpu_flags() -> FrozenSet[str]:
+    """Return the CPU feature flags, read once per process"""
+    # /proc/cpuinfo is much cheaper than py-cpuinfo, which may spawn helpers
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key.strip() in ("flags", "Features"):
+                    return frozenset(value.split())
+    except OSError:
+        pass
+
+    if CPUINFO_AVAILABLE:
+        try:
+            return frozenset(cpuinfo.get_cpu_info().get("flags", []))
+        except Exception:
+            pass
+
+    return frozenset()
+
+
+def has_sha_extensions() -> bool:
+    """Check for Intel/AMD SHA extensions, which OpenSSL uses for hashlib.sha256"""
+    return bool(get_cpu_flags() & _SHA_FLAGS)
+
+
+def has_arm_sha2() -> bool:
+    """Check for ARMv8 SHA2 instructions, which OpenSSL uses for hashlib.sha256"""
+    # Every Apple Silicon core has them, but macOS has no /proc/cpuinfo
+    if platform.system() == "Darwin" and platform.machine() == "arm64":
+        return True
+    return bool(get_cpu_flags() & _ARM_SHA_FLAGS)
+
+
+def get_sha256_backend() -> str:
+    """Name the SHA-256 instruction set hashlib runs on for this CPU"""
+    if has_sha_extensions():
+        return "sha-ni"
+    if has_arm_sha2():
+        return "armv8-sha2"
+    return "standard"
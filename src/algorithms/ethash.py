@@ -4,10 +4,73 @@ Ethereum and other Ethash-based cryptocurrencies
 """
 
 import hashlib
-import random
-from typing import Dict, Any, Optional
+import mmap
+import os
+import stat
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
 
-from .base import BaseAlgorithm
+from .base import BaseAlgorithm, target_to_bytes
+from .ethash_cuda import CUDA_AVAILABLE, MAX_PREFIX_SIZE, EthashCudaBackend
+
+
+# Little-endian 32-bit nonce, packed straight into a reusable buffer
+_NONCE_STRUCT = struct.Struct("<I")
+
+# Process-wide LRU of memory-mapped caches keyed by (epoch, cache_size)
+_EPOCH_CACHE: "OrderedDict[Tuple[int, int], Union[mmap.mmap, bytearray]]" = OrderedDict()
+_EPOCH_CACHE_MAX = 2
+_EPOCH_CACHE_LOCK = threading.Lock()
+_CACHE_BLOCK_SIZE = 4096
+
+
+@lru_cache(maxsize=256)
+def _target_from_hex(target: str) -> bytes:
+    """Parse a hex target into a 32-byte big-endian buffer (ValueError if invalid)"""
+    return target_to_bytes(int(target, 16))
+
+
+@lru_cache(maxsize=256)
+def _target_from_difficulty(difficulty: float) -> bytes:
+    """Ethereum-style target for a difficulty as a 32-byte big-endian buffer"""
+    max_target = 0x00000000FFFF0000000000000000000000000000000000000000000000000000
+    return target_to_bytes(int(max_target / difficulty))
+
+
+def _default_cache_dir() -> Path:
+    """Per-user cache directory; the shared temp dir would let other users plant caches"""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "the-miner"
+
+
+class _HashScratch:
+    """Per-thread buffers reused across nonces and work units"""
+    
+    __slots__ = ("nonce_buf", "mix_buf", "base_ctx", "empty_ctx")
+    
+    def __init__(self):
+        self.nonce_buf = bytearray(_NONCE_STRUCT.size)
+        self.mix_buf = bytearray(64)  # header hash || cache item
+        self.base_ctx = None
+        # Copying an initialised context is cheaper than constructing one
+        self.empty_ctx = hashlib.sha256()
+
+
+_thread_local = threading.local()
+
+
+def _get_scratch() -> _HashScratch:
+    """Return the calling thread's scratch buffers, creating them once"""
+    scratch = getattr(_thread_local, "scratch", None)
+    if scratch is None:
+        scratch = _thread_local.scratch = _HashScratch()
+    return scratch
 
 
 class EthashAlgorithm(BaseAlgorithm):
@@ -19,25 +82,104 @@ class EthashAlgorithm(BaseAlgorithm):
         self.dataset_size = self.config.get("dataset_size", 4 * 1024 * 1024 * 1024)  # 4GB
         self.epoch = self.config.get("epoch", 0)
         self.batch_size = self.config.get("batch_size", 100)
+        # GPU offload is opt-in, as for SHA-256
+        self.use_gpu = self.config.get("use_gpu", False)
+        self.gpu_device = self.config.get("gpu_device", 0)
+        self._gpu_backend = None
         
         # Initialize cache (simplified for demo)
         self.cache = self._generate_cache()
+        self._cache_items = len(self.cache) // 32
         
     def get_algorithm_type(self) -> str:
         """Return algorithm type"""
         return "GPU"
     
-    def _generate_cache(self) -> bytes:
+    def _generate_cache(self) -> memoryview:
         """Generate Ethash cache (simplified)"""
         # In real implementation, this would be much more complex
-        seed = f"ethash_seed_{self.epoch}".encode()
-        cache = hashlib.sha256(seed).digest()
+        key = (self.epoch, self.cache_size)
+        
+        with _EPOCH_CACHE_LOCK:
+            cache = _EPOCH_CACHE.get(key)
+            if cache is None:
+                cache = self._load_cache()
+                _EPOCH_CACHE[key] = cache
+                # Evicted maps are only dropped, never closed: older
+                # instances may still hold views into them
+                while len(_EPOCH_CACHE) > _EPOCH_CACHE_MAX:
+                    _EPOCH_CACHE.popitem(last=False)
+            else:
+                _EPOCH_CACHE.move_to_end(key)
         
-        # Expand to cache size
-        while len(cache) < self.cache_size:
-            cache = hashlib.sha256(cache).digest() + cache
+        return memoryview(cache)
+    
+    def _load_cache(self) -> Union[mmap.mmap, bytearray]:
+        """Map the on-disk cache for this epoch, building it on first use"""
+        cache_dir = Path(self.config.get("cache_dir") or _default_cache_dir())
+        path = cache_dir / f"miner_ethash_{self.epoch}_{self.cache_size}.cache"
+        
+        try:
+            if not self._cache_file_usable(path):
+                cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+                self._write_cache_file(path)
+            
+            with open(path, "rb") as f:
+                if hasattr(mmap, "MAP_POPULATE"):
+                    return mmap.mmap(f.fileno(), self.cache_size,
+                                     flags=mmap.MAP_SHARED | mmap.MAP_POPULATE,
+                                     prot=mmap.PROT_READ)
+                return mmap.mmap(f.fileno(), self.cache_size, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Unwritable cache dir or empty cache: keep it in memory instead
+            cache = bytearray(self.cache_size)
+            view = memoryview(cache)
+            offset = 0
+            for block in self._iter_cache_blocks():
+                view[offset:offset + len(block)] = block
+                offset += len(block)
+            return cache
+    
+    def _cache_file_usable(self, path: Path) -> bool:
+        """Whether path is a regular cache file of the right size that only we can write"""
+        try:
+            st = path.lstat()
+        except FileNotFoundError:
+            return False
+        if not stat.S_ISREG(st.st_mode) or st.st_size != self.cache_size:
+            return False
+        # Another user could have planted or still rewrite the file
+        if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o022):
+            return False
+        return True
+    
+    def _write_cache_file(self, path: Path):
+        """Write the cache to a private temp file and atomically move it into place"""
+        # mkstemp creates the file exclusively (O_EXCL) with mode 0600, so a
+        # planted file or symlink at the temp name is never followed
+        fd, tmp_name = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for block in self._iter_cache_blocks():
+                    f.write(block)
+            os.replace(tmp_name, path)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+    
+    def _iter_cache_blocks(self):
+        """Yield the cache as a linear SHA-256 chain in 4KB blocks"""
+        digest = hashlib.sha256(f"ethash_seed_{self.epoch}".encode()).digest()
+        block = bytearray(_CACHE_BLOCK_SIZE)
+        view = memoryview(block)
         
-        return cache[:self.cache_size]
+        remaining = self.cache_size
+        while remaining > 0:
+            for offset in range(0, _CACHE_BLOCK_SIZE, 32):
+                view[offset:offset + 32] = digest
+                digest = hashlib.sha256(digest).digest()
+            yield view[:min(remaining, _CACHE_BLOCK_SIZE)]
+            remaining -= _CACHE_BLOCK_SIZE
     
     def mine(self, work_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -51,70 +193,129 @@ class EthashAlgorithm(BaseAlgorithm):
         target = work_data.get("target", "0000000000000000")
         difficulty = work_data.get("difficulty", 1.0)
         
-        # Convert target to integer
+        # Convert target to a 32-byte big-endian buffer; digests are compared
+        # against it directly, without converting them to integers
         try:
-            target_int = int(target, 16)
+            target_bytes = _target_from_hex(target)
         except ValueError:
-            target_int = self._get_target_from_difficulty(difficulty)
+            target_bytes = self._get_target_from_difficulty(difficulty)
         
-        # Mine in batches
+        # Hash the constant header prefix once; every nonce resumes from a copy
+        data_bytes = data.encode()
+        scratch = _get_scratch()
+        scratch.base_ctx = hashlib.sha256(data_bytes)
+        
+        # Sweep the whole batch on the GPU when a device is attached
+        if self._gpu_backend is not None and len(data_bytes) <= MAX_PREFIX_SIZE:
+            try:
+                return self._mine_gpu(data_bytes, target_bytes, difficulty, scratch)
+            except Exception:
+                # Any device error drops this instance back to the CPU path
+                self._release_gpu()
+        
+        # Bind hot-loop lookups once per work unit
+        calculate_hash = self._calculate_ethash_hash
+        
+        # Mine in batches, recording hashes once per batch
         for batch_start in range(0, self.batch_size, 10):
             if not self.running:
                 return None
             
-            for i in range(10):
-                nonce = batch_start + i
-                
+            for nonce in range(batch_start, batch_start + 10):
                 # Ethash hash calculation (simplified)
-                hash_result = self._calculate_ethash_hash(data, nonce)
-                
-                self.record_hash()
+                digest = calculate_hash(nonce, scratch)
                 
                 # Check if hash meets target
-                hash_int = int(hash_result, 16)
-                if hash_int < target_int:
-                    return {
-                        "valid": True,
-                        "nonce": nonce,
-                        "hash": hash_result,
-                        "difficulty": difficulty,
-                        "algorithm": "Ethash",
-                        "timestamp": time.time(),
-                        "epoch": self.epoch
-                    }
+                if digest < target_bytes:
+                    self.record_hash(nonce - batch_start + 1)
+                    return self._build_share(nonce, digest, difficulty)
+            
+            self.record_hash(10)
         
         return None
     
-    def _calculate_ethash_hash(self, data: str, nonce: int) -> str:
+    def _mine_gpu(self, data_bytes: bytes, target_bytes: bytes, difficulty: float,
+                  scratch: _HashScratch) -> Optional[Dict[str, Any]]:
+        """Sweep the batch on the GPU and verify any hit on the CPU"""
+        nonce = self._gpu_backend.search(data_bytes, target_bytes, 0, self.batch_size)
+        
+        if nonce is None:
+            self.record_hash(self.batch_size)
+            return None
+        
+        self.record_hash(nonce + 1)
+        digest = self._calculate_ethash_hash(nonce, scratch)
+        if digest >= target_bytes:
+            raise RuntimeError(f"GPU share at nonce {nonce} failed CPU verification")
+        return self._build_share(nonce, digest, difficulty)
+    
+    def _build_share(self, nonce: int, digest: bytes, difficulty: float) -> Dict[str, Any]:
+        """Build the result dict for a hash that met the target"""
+        return {
+            "valid": True,
+            "nonce": nonce,
+            "hash": digest.hex(),
+            "difficulty": difficulty,
+            "algorithm": "Ethash",
+            "timestamp": time.time(),
+            "epoch": self.epoch
+        }
+    
+    def _calculate_ethash_hash(self, nonce: int, scratch: _HashScratch) -> bytes:
         """
         Calculate Ethash hash (simplified version)
         Real implementation would be much more complex
+        
+        Resumes from the header prefix context prepared by mine() and
+        returns the raw 32-byte digest.
         """
         # Header hash
-        header_hash = hashlib.sha256(f"{data}{nonce:08x}".encode()).hexdigest()
+        _NONCE_STRUCT.pack_into(scratch.nonce_buf, 0, nonce & 0xFFFFFFFF)
+        ctx = scratch.base_ctx.copy()
+        ctx.update(scratch.nonce_buf)
         
         # Mix with cache (simplified)
-        cache_index = nonce % (len(self.cache) // 32)
-        cache_slice = self.cache[cache_index * 32:(cache_index + 1) * 32]
+        mix = scratch.mix_buf
+        mix[:32] = ctx.digest()
+        cache_offset = (nonce % self._cache_items) * 32
+        mix[32:] = self.cache[cache_offset:cache_offset + 32]
         
         # Final hash
-        combined = header_hash.encode() + cache_slice
-        final_hash = hashlib.sha256(hashlib.sha256(combined).digest()).hexdigest()
-        
-        return final_hash
+        ctx = scratch.empty_ctx.copy()
+        ctx.update(mix)
+        inner = ctx.digest()
+        ctx = scratch.empty_ctx.copy()
+        ctx.update(inner)
+        return ctx.digest()
     
-    def _get_target_from_difficulty(self, difficulty: float) -> int:
-        """Calculate target from difficulty"""
-        # Ethereum target calculation
-        max_target = 0x00000000FFFF0000000000000000000000000000000000000000000000000000
-        return int(max_target / difficulty)
+    def _get_target_from_difficulty(self, difficulty: float) -> bytes:
+        """Calculate target from difficulty as a 32-byte big-endian buffer"""
+        # Ethereum target calculation, memoized per difficulty
+        return _target_from_difficulty(difficulty)
     
     def _on_start(self):
         """Called when algorithm starts"""
         self.update_performance_data("cache_size", self.cache_size)
         self.update_performance_data("epoch", self.epoch)
         self.update_performance_data("memory_hard", True)
+        
+        if self.use_gpu and CUDA_AVAILABLE and self._gpu_backend is None:
+            try:
+                self._gpu_backend = EthashCudaBackend(self.cache, self.gpu_device)
+            except Exception:
+                self._gpu_backend = None
+        self.update_performance_data("gpu_accelerated", self._gpu_backend is not None)
     
     def _on_stop(self):
         """Called when algorithm stops"""
-        pass
+        self._release_gpu()
+    
+    def _release_gpu(self):
+        """Detach from the GPU and fall back to CPU mining"""
+        backend, self._gpu_backend = self._gpu_backend, None
+        if backend is not None:
+            try:
+                backend.close()
+            except Exception:
+                pass
+        self.update_performance_data("gpu_accelerated", False)
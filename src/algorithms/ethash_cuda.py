@@ -0,0 +1,118 @@
+"""
+Ethash CUDA Backend
+Runs the simplified Ethash nonce sweep on NVIDIA GPUs through PyCUDA
+"""
+
+from typing import Optional
+
+try:
+    import numpy as np
+    import pycuda.driver as cuda
+    from pycuda.compiler import SourceModule
+    CUDA_AVAILABLE = True
+except ImportError:
+    CUDA_AVAILABLE = False
+
+from .sha256_cuda import MAX_PREFIX_SIZE, NO_NONCE, SHA256_DEVICE_SOURCE, target_words
+
+
+_KERNEL_SOURCE = SHA256_DEVICE_SOURCE + """
+__global__ void ethash_batch(int prefix_len, const unsigned char *cache, unsigned int cache_items,
+                             const unsigned int *target, unsigned int nonce_start,
+                             unsigned int count, unsigned int *found_nonce)
+{
+    unsigned int idx = blockIdx.x * blockDim.x + threadIdx.x;
+    if (idx >= count)
+        return;
+
+    unsigned int nonce = nonce_start + idx;
+    unsigned char suffix[4], combined[64], inner[32];
+    unsigned int hash[8];
+
+    for (int i = 0; i < 4; i++)
+        suffix[i] = (nonce >> (8 * i)) & 0xff;
+    sha256_prefixed(prefix_len, suffix, 4, combined);
+    unsigned long long offset = (unsigned long long)(nonce % cache_items) * 32;
+    for (int i = 0; i < 32; i++)
+        combined[32 + i] = cache[offset + i];
+
+    sha256_short(combined, 64, inner);
+    sha256_32byte(inner, hash);
+
+    if (below_target(hash, target))
+        atomicMin(found_nonce, nonce);
+}
+"""
+
+
+class EthashCudaBackend:
+    """GPU nonce search sharing one device-resident copy of the Ethash cache"""
+
+    THREADS_PER_BLOCK = 256
+
+    def __init__(self, cache: memoryview, device_id: int = 0):
+        if not CUDA_AVAILABLE:
+            raise RuntimeError("PyCUDA is not available")
+
+        self.cache_items = len(cache) // 32
+        if self.cache_items == 0:
+            raise ValueError("Ethash cache is smaller than one item")
+
+        cuda.init()
+        self._context = cuda.Device(device_id).make_context()
+        try:
+            module = SourceModule(_KERNEL_SOURCE)
+            self._kernel = module.get_function("ethash_batch")
+            self._prefix_gpu, _ = module.get_global("header_prefix")
+
+            # The cache is read-only for the lifetime of the epoch: upload once
+            self._cache_gpu = cuda.to_device(np.frombuffer(cache, dtype=np.uint8))
+            self._target_gpu = cuda.mem_alloc(32)
+            self._found_gpu = cuda.mem_alloc(4)
+            self._found_host = cuda.pagelocked_empty(1, dtype=np.uint32)
+            self._stream = cuda.Stream()
+        finally:
+            self._context.pop()
+
+    def search(self, prefix: bytes, target: bytes, nonce_start: int, count: int) -> Optional[int]:
+        """
+        Search count nonces starting at nonce_start
+
+        Returns the lowest nonce whose hash is below the 32-byte big-endian
+        target, or None if the batch holds no share.
+        """
+        if len(prefix) > MAX_PREFIX_SIZE:
+            raise ValueError(f"Header prefix exceeds {MAX_PREFIX_SIZE} bytes")
+
+        self._context.push()
+        try:
+            if prefix:
+                cuda.memcpy_htod(self._prefix_gpu, np.frombuffer(prefix, dtype=np.uint8))
+            cuda.memcpy_htod(self._target_gpu, target_words(target))
+            self._found_host[0] = NO_NONCE
+            cuda.memcpy_htod(self._found_gpu, self._found_host)
+
+            grid = ((count + self.THREADS_PER_BLOCK - 1) // self.THREADS_PER_BLOCK, 1)
+            self._kernel(
+                np.int32(len(prefix)), self._cache_gpu, np.uint32(self.cache_items),
+                self._target_gpu, np.uint32(nonce_start), np.uint32(count), self._found_gpu,
+                block=(self.THREADS_PER_BLOCK, 1, 1), grid=grid, stream=self._stream
+            )
+            cuda.memcpy_dtoh_async(self._found_host, self._found_gpu, self._stream)
+            self._stream.synchronize()
+
+            nonce = int(self._found_host[0])
+            return None if nonce == NO_NONCE else nonce
+        finally:
+            self._context.pop()
+
+    def close(self):
+        """Release device memory and the CUDA context"""
+        self._context.push()
+        try:
+            self._cache_gpu.free()
+            self._target_gpu.free()
+            self._found_gpu.free()
+        finally:
+            self._context.pop()
+            self._context.detach()
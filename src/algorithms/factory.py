@@ -3,6 +3,8 @@ Algorithm Factory
 Creates and manages mining algorithm instances
 """
 
+import sys
+from collections import namedtuple
 from typing import Dict, Any, Type
 from .base import BaseAlgorithm
 from .sha256 import SHA256Algorithm
@@ -10,17 +12,18 @@ from .ethash import EthashAlgorithm
 from .randomx import RandomXAlgorithm
 
 
+# Interned registry name, algorithm class and its descriptive info
+AlgoEntry = namedtuple("AlgoEntry", "name cls info")
+
+
 class AlgorithmFactory:
     """Factory for creating mining algorithm instances"""
     
     def __init__(self):
-        self._algorithms: Dict[str, Type[BaseAlgorithm]] = {
-            "sha256": SHA256Algorithm,
-            "ethash": EthashAlgorithm,
-            "randomx": RandomXAlgorithm,
-        }
+        self._registry: Dict[str, AlgoEntry] = {}
+        self._by_type: Dict[str, Dict[str, Dict[str, str]]] = {}
         
-        self._algorithm_info = {
+        builtin_info = {
             "sha256": {
                 "name": "SHA-256",
                 "description": "Bitcoin and SHA-256 based cryptocurrencies",
@@ -46,6 +49,20 @@ class AlgorithmFactory:
                 "efficiency": "Low"
             }
         }
+        
+        self.register_algorithm("sha256", SHA256Algorithm, builtin_info["sha256"])
+        self.register_algorithm("ethash", EthashAlgorithm, builtin_info["ethash"])
+        self.register_algorithm("randomx", RandomXAlgorithm, builtin_info["randomx"])
+    
+    def _lookup(self, algorithm_name: str) -> AlgoEntry:
+        """Find a registry entry, only lowercasing names that miss as given"""
+        entry = self._registry.get(algorithm_name)
+        if entry is None:
+            algorithm_name = algorithm_name.lower()
+            entry = self._registry.get(algorithm_name)
+            if entry is None:
+                raise ValueError(f"Unsupported algorithm: {algorithm_name}")
+        return entry
     
     def create_algorithm(self, algorithm_name: str, config: Dict[str, Any]) -> BaseAlgorithm:
         """
@@ -61,26 +78,16 @@ class AlgorithmFactory:
         Raises:
             ValueError: If algorithm is not supported
         """
-        algorithm_name = algorithm_name.lower()
-        
-        if algorithm_name not in self._algorithms:
-            raise ValueError(f"Unsupported algorithm: {algorithm_name}")
-        
-        algorithm_class = self._algorithms[algorithm_name]
-        return algorithm_class(algorithm_name, config)
+        entry = self._lookup(algorithm_name)
+        return entry.cls(entry.name, config)
     
     def get_available_algorithms(self) -> Dict[str, Dict[str, str]]:
         """Get information about all available algorithms"""
-        return self._algorithm_info.copy()
+        return {name: entry.info for name, entry in self._registry.items()}
     
     def get_algorithm_info(self, algorithm_name: str) -> Dict[str, str]:
         """Get information about a specific algorithm"""
-        algorithm_name = algorithm_name.lower()
-        
-        if algorithm_name not in self._algorithm_info:
-            raise ValueError(f"Unsupported algorithm: {algorithm_name}")
-        
-        return self._algorithm_info[algorithm_name].copy()
+        return self._lookup(algorithm_name).info.copy()
     
     def register_algorithm(self, algorithm_name: str, algorithm_class: Type[BaseAlgorithm], 
                           info: Dict[str, str]):
@@ -92,21 +99,19 @@ class AlgorithmFactory:
             algorithm_class: Algorithm class
             info: Algorithm information
         """
-        algorithm_name = algorithm_name.lower()
+        algorithm_name = sys.intern(algorithm_name.lower())
         
-        self._algorithms[algorithm_name] = algorithm_class
-        self._algorithm_info[algorithm_name] = info
+        previous = self._registry.get(algorithm_name)
+        if previous is not None:
+            self._by_type.get(previous.info.get("type", "").upper(), {}).pop(algorithm_name, None)
+        
+        self._registry[algorithm_name] = AlgoEntry(algorithm_name, algorithm_class, info)
+        self._by_type.setdefault(info.get("type", "").upper(), {})[algorithm_name] = info
     
     def is_supported(self, algorithm_name: str) -> bool:
         """Check if an algorithm is supported"""
-        return algorithm_name.lower() in self._algorithms
+        return algorithm_name in self._registry or algorithm_name.lower() in self._registry
     
     def get_algorithms_by_type(self, algorithm_type: str) -> Dict[str, Dict[str, str]]:
         """Get algorithms filtered by type (CPU, GPU, ASIC)"""
-        filtered = {}
-        
-        for name, info in self._algorithm_info.items():
-            if info.get("type", "").upper() == algorithm_type.upper():
-                filtered[name] = info
-        
-        return filtered
+        return dict(self._by_type.get(algorithm_type.upper(), {}))
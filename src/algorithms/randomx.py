@@ -4,11 +4,71 @@ Monero and other RandomX-based cryptocurrencies
 """
 
 import hashlib
-import random
+import threading
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
-from .base import BaseAlgorithm
+from .base import BaseAlgorithm, target_to_bytes
+
+
+# Full-period 32-bit LCG driving scratchpad addresses
+_LCG_MULTIPLIER = 0x915F77F5
+_LCG_INCREMENT = 0x3C6EF35F
+
+_thread_local = threading.local()
+
+
+def _get_scratchpad(size: int) -> Tuple[bytearray, memoryview]:
+    """
+    Return the calling thread's all-zero scratchpad and its uint32 word view
+    
+    The pad is allocated once per thread and size; callers must zero every
+    byte they touch before returning it.
+    """
+    scratchpad = getattr(_thread_local, "scratchpad", None)
+    if scratchpad is None or len(scratchpad[0]) != size:
+        pad = bytearray(size)
+        words = memoryview(pad)[:size - size % 4].cast("I")
+        scratchpad = _thread_local.scratchpad = (pad, words)
+    return scratchpad
+
+
+def _mix_scratchpad(words: memoryview, nonce: int, touched: list):
+    """
+    Run the 1000 simulated RandomX rounds over the scratchpad words
+    
+    The four round operations are unrolled into one pass per group of four
+    rounds, so the loop carries no per-round branch. Every written word
+    index is appended to touched before it is modified.
+    """
+    multiplier = _LCG_MULTIPLIER
+    increment = _LCG_INCREMENT
+    word_count = len(words)
+    mark = touched.append
+    state = nonce & 0xFFFFFFFF
+    
+    for round_num in range(0, 1000, 4):
+        # Random memory access: the LCG's high bits pick a word
+        state = (state * multiplier + increment) & 0xFFFFFFFF
+        index = (state * word_count) >> 32
+        mark(index)
+        words[index] = (words[index] + nonce) & 0xFFFFFFFF
+        
+        state = (state * multiplier + increment) & 0xFFFFFFFF
+        index = (state * word_count) >> 32
+        mark(index)
+        words[index] = (words[index] * 1103515245 + 12345) & 0xFFFFFFFF
+        
+        state = (state * multiplier + increment) & 0xFFFFFFFF
+        index = (state * word_count) >> 32
+        mark(index)
+        value = words[index]
+        words[index] = value ^ (value >> 16)
+        
+        state = (state * multiplier + increment) & 0xFFFFFFFF
+        index = (state * word_count) >> 32
+        mark(index)
+        words[index] = (words[index] + round_num + 3) & 0xFFFFFFFF
 
 
 class RandomXAlgorithm(BaseAlgorithm):
@@ -20,24 +80,21 @@ class RandomXAlgorithm(BaseAlgorithm):
         self.scratchpad_size = self.config.get("scratchpad_size", 2 * 1024 * 1024)  # 2MB
         self.batch_size = self.config.get("batch_size", 50)
         
-        # Initialize dataset (simplified)
-        self.dataset = self._generate_dataset()
+        # Initialize dataset (simplified): items are derived from the seed on
+        # demand, so the full dataset is never materialized
+        seed = f"randomx_seed_{int(time.time())}".encode()
+        self.dataset_seed = hashlib.sha256(seed).digest()
+        self.dataset_items = max(1, self.dataset_size // 32)
         
     def get_algorithm_type(self) -> str:
         """Return algorithm type"""
         return "CPU"
     
-    def _generate_dataset(self) -> bytes:
-        """Generate RandomX dataset (simplified)"""
-        # Real RandomX dataset generation is much more complex
-        seed = f"randomx_seed_{int(time.time())}".encode()
-        dataset = hashlib.sha256(seed).digest()
-        
-        # Expand to dataset size
-        while len(dataset) < self.dataset_size:
-            dataset = hashlib.sha256(dataset).digest() + dataset
-        
-        return dataset[:self.dataset_size]
+    def _get_dataset_item(self, index: int) -> bytes:
+        """Derive one 32-byte RandomX dataset item (simplified)"""
+        # Real RandomX dataset generation is much more complex. Each item is
+        # SHA-256(seed || index), independent of every other item
+        return hashlib.sha256(self.dataset_seed + index.to_bytes(8, "little")).digest()
     
     def mine(self, work_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -51,11 +108,15 @@ class RandomXAlgorithm(BaseAlgorithm):
         target = work_data.get("target", "0000000000000000")
         difficulty = work_data.get("difficulty", 1.0)
         
-        # Convert target to integer
+        # Convert target to 32 big-endian bytes to compare raw digests against
         try:
             target_int = int(target, 16)
         except ValueError:
             target_int = self._get_target_from_difficulty(difficulty)
+        target_bytes = target_to_bytes(target_int)
+        
+        # The header prefix is encoded once; only the nonce changes per hash
+        header_prefix = data.encode()
         
         # Mine in batches
         for batch_start in range(0, self.batch_size, 5):
@@ -66,17 +127,16 @@ class RandomXAlgorithm(BaseAlgorithm):
                 nonce = batch_start + i
                 
                 # RandomX hash calculation (simplified)
-                hash_result = self._calculate_randomx_hash(data, nonce)
+                digest = self._calculate_randomx_hash(header_prefix, nonce)
                 
                 self.record_hash()
                 
                 # Check if hash meets target
-                hash_int = int(hash_result, 16)
-                if hash_int < target_int:
+                if digest < target_bytes:
                     return {
                         "valid": True,
                         "nonce": nonce,
-                        "hash": hash_result,
+                        "hash": digest.hex(),
                         "difficulty": difficulty,
                         "algorithm": "RandomX",
                         "timestamp": time.time()
@@ -84,47 +144,42 @@ class RandomXAlgorithm(BaseAlgorithm):
         
         return None
     
-    def _calculate_randomx_hash(self, data: str, nonce: int) -> str:
+    def _calculate_randomx_hash(self, header_prefix: bytes, nonce: int) -> bytes:
         """
         Calculate RandomX hash (simplified version)
         Real implementation would use actual RandomX algorithm
+        
+        header_prefix is the UTF-8 encoded work data. Returns the raw
+        32-byte digest.
         """
-        # Create scratchpad
-        scratchpad = bytearray(self.scratchpad_size)
+        # Reuse this thread's scratchpad instead of allocating 2MB per hash
+        scratchpad, words = _get_scratchpad(self.scratchpad_size)
         
         # Fill scratchpad with data and nonce
-        input_data = f"{data}{nonce:08x}".encode()
-        for i in range(min(len(input_data), self.scratchpad_size)):
-            scratchpad[i] = input_data[i]
+        input_data = (header_prefix + b"%08x" % nonce)[:self.scratchpad_size]
+        scratchpad[:len(input_data)] = input_data
         
         # RandomX execution simulation (simplified)
-        # Real RandomX would execute random code sequences
-        for round_num in range(1000):
-            # Random memory access
-            index = random.randint(0, self.scratchpad_size - 4)
-            value = int.from_bytes(scratchpad[index:index+4], 'little')
-            
-            # Random operation
-            if round_num % 4 == 0:
-                value = (value + nonce) % 2**32
-            elif round_num % 4 == 1:
-                value = (value * 1103515245 + 12345) % 2**32
-            elif round_num % 4 == 2:
-                value = value ^ (value >> 16)
-            else:
-                value = (value + round_num) % 2**32
+        # Real RandomX would execute random code sequences. Addresses come from
+        # a per-nonce LCG stream, so the hash is reproducible. Words are read
+        # in native byte order (little-endian on supported platforms)
+        touched = []
+        try:
+            _mix_scratchpad(words, nonce, touched)
             
-            scratchpad[index:index+4] = value.to_bytes(4, 'little')
+            mixed = bytes(scratchpad[:64])
+        finally:
+            # Hand the pad back all-zero by clearing only what was written
+            for index in touched:
+                words[index] = 0
+            scratchpad[:len(input_data)] = bytes(len(input_data))
         
         # Mix with dataset
-        dataset_index = nonce % (len(self.dataset) // 32)
-        dataset_slice = self.dataset[dataset_index * 32:(dataset_index + 1) * 32]
+        dataset_slice = self._get_dataset_item(nonce % self.dataset_items)
         
         # Final hash
-        combined = bytes(scratchpad[:64]) + dataset_slice
-        final_hash = hashlib.sha256(hashlib.sha256(combined).digest()).hexdigest()
-        
-        return final_hash
+        combined = mixed + dataset_slice
+        return hashlib.sha256(hashlib.sha256(combined).digest()).digest()
     
     def _get_target_from_difficulty(self, difficulty: float) -> int:
         """Calculate target from difficulty"""
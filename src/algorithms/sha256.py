@@ -5,9 +5,11 @@ Bitcoin and other SHA-256 based cryptocurrencies
 
 import hashlib
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
-from .base import BaseAlgorithm
+from .base import BaseAlgorithm, target_to_bytes
+from .cpu_features import get_sha256_backend
+from .sha256_cuda import CUDA_AVAILABLE, MAX_PREFIX_SIZE, Sha256CudaBackend
 
 
 class SHA256Algorithm(BaseAlgorithm):
@@ -19,6 +21,12 @@ class SHA256Algorithm(BaseAlgorithm):
         self.max_nonce = 2**32 - 1
         self.batch_size = self.config.get("batch_size", 1000)
         
+        # GPU offload is opt-in; each GPU call scans gpu_batch_size nonces
+        self.use_gpu = self.config.get("use_gpu", False)
+        self.gpu_device = self.config.get("gpu_device", 0)
+        self.gpu_batch_size = self.config.get("gpu_batch_size", 1 << 20)
+        self._gpu_backend = None
+        
     def get_algorithm_type(self) -> str:
         """Return algorithm type"""
         return "CPU"
@@ -35,41 +43,93 @@ class SHA256Algorithm(BaseAlgorithm):
         target = work_data.get("target", "00000000")
         difficulty = work_data.get("difficulty", self.target_difficulty)
         
-        # Convert target to integer for comparison
+        # Convert target to 32 big-endian bytes to compare raw digests against
         try:
             target_int = int(target, 16)
         except ValueError:
             target_int = self._get_target_from_difficulty(difficulty)
+        target_bytes = target_to_bytes(target_int)
+        
+        header_prefix = data.encode()
+        
+        # Sweep a large nonce range on the GPU when a device is attached
+        if self._gpu_backend is not None and len(header_prefix) <= MAX_PREFIX_SIZE:
+            try:
+                return self._mine_gpu(header_prefix, target_bytes, difficulty)
+            except Exception:
+                self._release_gpu()
+        
+        # Midstate: the constant data prefix is hashed once per work unit and
+        # every nonce resumes from a copy of that context
+        prefix_ctx = hashlib.sha256(header_prefix)
         
         # Mine in batches for efficiency
         for batch_start in range(0, self.batch_size, 100):
             if not self.running:
                 return None
             
-            for i in range(100):
-                nonce = batch_start + i
-                if nonce > self.max_nonce:
-                    return None
-                
-                # Create block header
-                block_header = f"{data}{nonce:08x}".encode()
-                
-                # Double SHA-256
-                hash_result = hashlib.sha256(hashlib.sha256(block_header).digest()).hexdigest()
-                
-                self.record_hash()
-                
-                # Check if hash meets target
-                hash_int = int(hash_result, 16)
-                if hash_int < target_int:
-                    return {
-                        "valid": True,
-                        "nonce": nonce,
-                        "hash": hash_result,
-                        "difficulty": difficulty,
-                        "algorithm": "SHA-256",
-                        "timestamp": time.time()
-                    }
+            count = min(100, self.max_nonce + 1 - batch_start)
+            if count <= 0:
+                return None
+            
+            hit = self._scan_nonce_range(prefix_ctx, batch_start, count, target_bytes)
+            if hit is None:
+                self.record_hash(count)
+                continue
+            
+            nonce, digest = hit
+            self.record_hash(nonce - batch_start + 1)
+            return self._build_share(nonce, digest, difficulty)
+        
+        return None
+    
+    def _mine_gpu(self, header_prefix: bytes, target_bytes: bytes,
+                  difficulty: float) -> Optional[Dict[str, Any]]:
+        """Sweep gpu_batch_size nonces on the GPU and verify any hit on the CPU"""
+        count = min(self.gpu_batch_size, self.max_nonce + 1)
+        nonce = self._gpu_backend.search(header_prefix, target_bytes, 0, count)
+        
+        if nonce is None:
+            self.record_hash(count)
+            return None
+        
+        self.record_hash(nonce + 1)
+        hit = self._scan_nonce_range(hashlib.sha256(header_prefix), nonce, 1, target_bytes)
+        if hit is None:
+            raise RuntimeError(f"GPU share at nonce {nonce} failed CPU verification")
+        return self._build_share(nonce, hit[1], difficulty)
+    
+    def _build_share(self, nonce: int, digest: bytes, difficulty: float) -> Dict[str, Any]:
+        """Build the result dict for a hash that met the target"""
+        return {
+            "valid": True,
+            "nonce": nonce,
+            "hash": digest.hex(),
+            "difficulty": difficulty,
+            "algorithm": "SHA-256",
+            "timestamp": time.time()
+        }
+    
+    def _scan_nonce_range(self, prefix_ctx, nonce_start: int, count: int,
+                          target_bytes: bytes) -> Optional[Tuple[int, bytes]]:
+        """
+        Double SHA-256 count nonces starting at nonce_start
+        
+        prefix_ctx is a SHA-256 context that has already absorbed the block
+        header prefix. Returns the first (nonce, raw digest) below the
+        32-byte big-endian target, or None.
+        """
+        for nonce in range(nonce_start, nonce_start + count):
+            # Finish the block header from the prefix midstate
+            ctx = prefix_ctx.copy()
+            ctx.update(b"%08x" % nonce)
+            
+            # Double SHA-256
+            digest = hashlib.sha256(ctx.digest()).digest()
+            
+            # Check if hash meets target
+            if digest < target_bytes:
+                return nonce, digest
         
         return None
     
@@ -81,9 +141,28 @@ class SHA256Algorithm(BaseAlgorithm):
     
     def _on_start(self):
         """Called when algorithm starts"""
-        self.update_performance_data("optimization", "standard")
+        # hashlib runs on OpenSSL, which uses the x86 SHA extensions or the
+        # ARMv8 SHA2 instructions when the CPU has them
+        self.update_performance_data("optimization", get_sha256_backend())
         self.update_performance_data("vectorized", False)
+        
+        if self.use_gpu and CUDA_AVAILABLE and self._gpu_backend is None:
+            try:
+                self._gpu_backend = Sha256CudaBackend(self.gpu_device)
+            except Exception:
+                self._gpu_backend = None
+        self.update_performance_data("gpu_accelerated", self._gpu_backend is not None)
     
     def _on_stop(self):
         """Called when algorithm stops"""
-        pass
+        self._release_gpu()
+    
+    def _release_gpu(self):
+        """Detach from the GPU and fall back to CPU mining"""
+        backend, self._gpu_backend = self._gpu_backend, None
+        if backend is not None:
+            try:
+                backend.close()
+            except Exception:
+                pass
+        self.update_performance_data("gpu_accelerated", False)
@@ -0,0 +1,275 @@
+"""
+SHA-256 CUDA Backend
+Runs the double SHA-256 nonce scan on NVIDIA GPUs through PyCUDA
+"""
+
+from typing import Optional
+
+try:
+    import numpy as np
+    import pycuda.driver as cuda
+    from pycuda.compiler import SourceModule
+    CUDA_AVAILABLE = True
+except ImportError:
+    CUDA_AVAILABLE = False
+
+
+MAX_PREFIX_SIZE = 4096
+NO_NONCE = 0xFFFFFFFF
+
+# SHA-256 device functions shared by the GPU kernels. Messages are
+# header_prefix (constant memory) followed by a short per-thread suffix
+SHA256_DEVICE_SOURCE = """
+#define ROTR(x, n) (((x) >> (n)) | ((x) << (32 - (n))))
+#define MAX_PREFIX_SIZE %(max_prefix)d
+
+__constant__ unsigned int K[64] = {
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+};
+
+__constant__ unsigned char header_prefix[MAX_PREFIX_SIZE];
+
+__device__ void sha256_init(unsigned int *state)
+{
+    state[0] = 0x6a09e667; state[1] = 0xbb67ae85; state[2] = 0x3c6ef372; state[3] = 0xa54ff53a;
+    state[4] = 0x510e527f; state[5] = 0x9b05688c; state[6] = 0x1f83d9ab; state[7] = 0x5be0cd19;
+}
+
+/* Expand the message schedule in w[0..15] and run the 64 rounds */
+__device__ void sha256_transform(unsigned int *state, unsigned int *w)
+{
+    #pragma unroll
+    for (int i = 16; i < 64; i++) {
+        unsigned int s0 = ROTR(w[i - 15], 7) ^ ROTR(w[i - 15], 18) ^ (w[i - 15] >> 3);
+        unsigned int s1 = ROTR(w[i - 2], 17) ^ ROTR(w[i - 2], 19) ^ (w[i - 2] >> 10);
+        w[i] = w[i - 16] + s0 + w[i - 7] + s1;
+    }
+
+    unsigned int a = state[0], b = state[1], c = state[2], d = state[3];
+    unsigned int e = state[4], f = state[5], g = state[6], h = state[7];
+    #pragma unroll
+    for (int i = 0; i < 64; i++) {
+        unsigned int t1 = h + (ROTR(e, 6) ^ ROTR(e, 11) ^ ROTR(e, 25)) + ((e & f) ^ (~e & g)) + K[i] + w[i];
+        unsigned int t2 = (ROTR(a, 2) ^ ROTR(a, 13) ^ ROTR(a, 22)) + ((a & b) ^ (a & c) ^ (b & c));
+        h = g; g = f; f = e; e = d + t1;
+        d = c; c = b; b = a; a = t1 + t2;
+    }
+    state[0] += a; state[1] += b; state[2] += c; state[3] += d;
+    state[4] += e; state[5] += f; state[6] += g; state[7] += h;
+}
+
+__device__ void sha256_compress(unsigned int *state, const unsigned char *block)
+{
+    unsigned int w[64];
+    for (int i = 0; i < 16; i++) {
+        w[i] = ((unsigned int)block[4 * i] << 24) | ((unsigned int)block[4 * i + 1] << 16) |
+               ((unsigned int)block[4 * i + 2] << 8) | (unsigned int)block[4 * i + 3];
+    }
+    sha256_transform(state, w);
+}
+
+__device__ void sha256_digest(const unsigned int *state, unsigned char *out)
+{
+    for (int i = 0; i < 8; i++) {
+        out[4 * i] = (state[i] >> 24) & 0xff;
+        out[4 * i + 1] = (state[i] >> 16) & 0xff;
+        out[4 * i + 2] = (state[i] >> 8) & 0xff;
+        out[4 * i + 3] = state[i] & 0xff;
+    }
+}
+
+/* SHA-256 of a message of at most 64 bytes held in thread-local memory */
+__device__ void sha256_short(const unsigned char *msg, int len, unsigned char *out)
+{
+    unsigned char block[128];
+    unsigned int state[8];
+    int nblocks = (len + 9 + 63) / 64;
+    unsigned long long bits = (unsigned long long)len * 8;
+
+    for (int i = 0; i < nblocks * 64; i++)
+        block[i] = i < len ? msg[i] : (i == len ? 0x80 : 0);
+    for (int i = 0; i < 8; i++)
+        block[nblocks * 64 - 1 - i] = (bits >> (8 * i)) & 0xff;
+
+    sha256_init(state);
+    for (int i = 0; i < nblocks; i++)
+        sha256_compress(state, block + 64 * i);
+    sha256_digest(state, out);
+}
+
+/*
+ * SHA-256 of exactly 32 bytes, the outer hash of every double SHA-256.
+ * The single block is the digest followed by constant padding words, so
+ * with the schedule unrolled the compiler folds w[8..15] into the rounds.
+ * The result is left as the 8 big-endian state words.
+ */
+__device__ void sha256_32byte(const unsigned char *in, unsigned int *state)
+{
+    unsigned int w[64];
+
+    #pragma unroll
+    for (int i = 0; i < 8; i++) {
+        w[i] = ((unsigned int)in[4 * i] << 24) | ((unsigned int)in[4 * i + 1] << 16) |
+               ((unsigned int)in[4 * i + 2] << 8) | (unsigned int)in[4 * i + 3];
+    }
+    w[8] = 0x80000000;
+    #pragma unroll
+    for (int i = 9; i < 15; i++)
+        w[i] = 0;
+    w[15] = 32 * 8;
+
+    sha256_init(state);
+    sha256_transform(state, w);
+}
+
+/* SHA-256 of header_prefix || suffix */
+__device__ void sha256_prefixed(int prefix_len, const unsigned char *suffix, int suffix_len,
+                                unsigned char *out)
+{
+    unsigned char block[64];
+    unsigned int state[8];
+    int total = prefix_len + suffix_len;
+    int nblocks = (total + 9 + 63) / 64;
+    unsigned long long bits = (unsigned long long)total * 8;
+
+    sha256_init(state);
+    for (int b = 0; b < nblocks; b++) {
+        for (int j = 0; j < 64; j++) {
+            int i = b * 64 + j;
+            if (i < prefix_len)
+                block[j] = header_prefix[i];
+            else if (i < total)
+                block[j] = suffix[i - prefix_len];
+            else if (i == total)
+                block[j] = 0x80;
+            else if (i >= nblocks * 64 - 8)
+                block[j] = (bits >> (8 * (nblocks * 64 - 1 - i))) & 0xff;
+            else
+                block[j] = 0;
+        }
+        sha256_compress(state, block);
+    }
+    sha256_digest(state, out);
+}
+
+/*
+ * Branchless compare of a hash against the target, both as 8 big-endian
+ * words: lt0 | (eq0 & (lt1 | (eq1 & ... lt7))), built from the last word up
+ */
+__device__ bool below_target(const unsigned int *hash, const unsigned int *target)
+{
+    bool lt = false;
+    #pragma unroll
+    for (int i = 7; i >= 0; i--)
+        lt = (hash[i] < target[i]) | ((hash[i] == target[i]) & lt);
+    return lt;
+}
+""" % {"max_prefix": MAX_PREFIX_SIZE}
+
+_KERNEL_SOURCE = SHA256_DEVICE_SOURCE + """
+/* Lowercase hex digit for the low 4 bits of v */
+__device__ unsigned char hex_digit(unsigned int v)
+{
+    v &= 0xf;
+    return v < 10 ? '0' + v : 'a' + v - 10;
+}
+
+/* SHA-256(SHA-256(header_prefix || "%08x" % nonce)) for count nonces */
+__global__ void sha256d_scan(int prefix_len, const unsigned int *target, unsigned int nonce_start,
+                             unsigned int count, unsigned int *found_nonce)
+{
+    unsigned int idx = blockIdx.x * blockDim.x + threadIdx.x;
+    if (idx >= count)
+        return;
+
+    unsigned int nonce = nonce_start + idx;
+    unsigned char suffix[8], inner[32];
+    unsigned int hash[8];
+
+    for (int i = 0; i < 8; i++)
+        suffix[i] = hex_digit(nonce >> (28 - 4 * i));
+    sha256_prefixed(prefix_len, suffix, 8, inner);
+    sha256_32byte(inner, hash);
+
+    if (below_target(hash, target))
+        atomicMin(found_nonce, nonce);
+}
+"""
+
+
+def target_words(target: bytes) -> "np.ndarray":
+    """Split a 32-byte big-endian target into the kernels' 8 native uint32 words"""
+    return np.frombuffer(target, dtype=">u4").astype(np.uint32)
+
+
+class Sha256CudaBackend:
+    """GPU nonce search for the SHA-256 miner's block header format"""
+
+    THREADS_PER_BLOCK = 256
+
+    def __init__(self, device_id: int = 0):
+        if not CUDA_AVAILABLE:
+            raise RuntimeError("PyCUDA is not available")
+
+        cuda.init()
+        self._context = cuda.Device(device_id).make_context()
+        try:
+            module = SourceModule(_KERNEL_SOURCE)
+            self._kernel = module.get_function("sha256d_scan")
+            self._prefix_gpu, _ = module.get_global("header_prefix")
+
+            self._target_gpu = cuda.mem_alloc(32)
+            self._found_gpu = cuda.mem_alloc(4)
+            self._found_host = cuda.pagelocked_empty(1, dtype=np.uint32)
+            self._stream = cuda.Stream()
+        finally:
+            self._context.pop()
+
+    def search(self, prefix: bytes, target: bytes, nonce_start: int, count: int) -> Optional[int]:
+        """
+        Search count nonces starting at nonce_start
+
+        Returns the lowest nonce whose hash is below the 32-byte big-endian
+        target, or None if the range holds no share.
+        """
+        if len(prefix) > MAX_PREFIX_SIZE:
+            raise ValueError(f"Header prefix exceeds {MAX_PREFIX_SIZE} bytes")
+
+        self._context.push()
+        try:
+            if prefix:
+                cuda.memcpy_htod(self._prefix_gpu, np.frombuffer(prefix, dtype=np.uint8))
+            cuda.memcpy_htod(self._target_gpu, target_words(target))
+            self._found_host[0] = NO_NONCE
+            cuda.memcpy_htod(self._found_gpu, self._found_host)
+
+            grid = ((count + self.THREADS_PER_BLOCK - 1) // self.THREADS_PER_BLOCK, 1)
+            self._kernel(
+                np.int32(len(prefix)), self._target_gpu, np.uint32(nonce_start),
+                np.uint32(count), self._found_gpu,
+                block=(self.THREADS_PER_BLOCK, 1, 1), grid=grid, stream=self._stream
+            )
+            cuda.memcpy_dtoh_async(self._found_host, self._found_gpu, self._stream)
+            self._stream.synchronize()
+
+            nonce = int(self._found_host[0])
+            return None if nonce == NO_NONCE else nonce
+        finally:
+            self._context.pop()
+
+    def close(self):
+        """Release device memory and the CUDA context"""
+        self._context.push()
+        try:
+            self._target_gpu.free()
+            self._found_gpu.free()
+        finally:
+            self._context.pop()
+            self._context.detach()
@@ -5,17 +5,27 @@ MetaMask and wallet management for mining earnings
 
 import json
 import time
-import threading
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from web3 import Web3
 import requests
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from utils.logger import get_logger
+from utils.scheduler import get_poll_scheduler
 
 logger = get_logger(__name__)
 
 
+WEI_PER_ETH = 10**18
+WEI_PER_GWEI = 10**9
+
+
 @dataclass
 class WalletInfo:
     address: str
@@ -41,9 +51,18 @@ class TransactionInfo:
 class MetaMaskIntegration:
     """MetaMask wallet integration for mining earnings"""
     
+    # Seconds a fetched value is served from memory before hitting the network again
+    PRICE_TTL = 60
+    BALANCE_TTL = 15
+    NETWORK_TTL = 15
+    TRANSACTIONS_TTL = 30
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         
+        # One keep-alive session for all HTTPS APIs avoids a TLS handshake per call
+        self._session = requests.Session()
+        
         # Web3 configuration
         self.infura_project_id = config.get("infura_project_id", "")
         self.network = config.get("network", "mainnet")
@@ -65,6 +84,15 @@ class MetaMaskIntegration:
         self.eth_price_usd = 0.0
         self.last_price_update = 0
         
+        # Monotonic times of the last network fetches, and cached transactions
+        # keyed by (address, limit)
+        self._price_checked_at = None
+        self._balance_checked_at = None
+        self._transactions_cache = {}
+        
+        # (monotonic time, latest block, gas price in wei) from the last RPC read
+        self._network_state = None
+        
         self._setup_web3()
     
     def _get_chain_id(self) -> int:
@@ -136,6 +164,8 @@ class MetaMaskIntegration:
             balance_eth = self.w3.from_wei(balance_wei, 'ether')
             
             # Update wallet info
+            self._balance_checked_at = time.monotonic()
+            self._transactions_cache.clear()
             self.wallet_info = WalletInfo(
                 address=checksum_address,
                 balance_eth=float(balance_eth),
@@ -161,6 +191,13 @@ class MetaMaskIntegration:
         if not self.wallet_info:
             return {"eth": 0.0, "usd": 0.0}
         
+        # Serve a recent balance without another RPC round-trip
+        now = time.monotonic()
+        if self._balance_checked_at is not None and now - self._balance_checked_at < self.BALANCE_TTL:
+            balance_eth = self.wallet_info.balance_eth
+            return {"eth": balance_eth, "usd": balance_eth * self.eth_price_usd}
+        self._balance_checked_at = now
+        
         # Update balance
         try:
             balance_wei = self.w3.eth.get_balance(self.wallet_info.address)
@@ -176,11 +213,52 @@ class MetaMaskIntegration:
             logger.error(f"Balance update error: {e}")
             return {"eth": self.wallet_info.balance_eth, "usd": self.wallet_info.balance_usd}
     
+    def refresh_chain_state(self):
+        """
+        Refresh a stale balance and network state in one JSON-RPC batch
+        
+        Needs web3.py 7+ for batch_requests; on older versions the values are
+        left to get_balance and get_network_info to fetch one call at a time.
+        """
+        if not self.connected or not hasattr(self.w3, "batch_requests"):
+            return
+        
+        now = time.monotonic()
+        balance_stale = self.wallet_info is not None and (
+            self._balance_checked_at is None or now - self._balance_checked_at >= self.BALANCE_TTL
+        )
+        network_stale = self._network_state is None or now - self._network_state[0] >= self.NETWORK_TTL
+        if not balance_stale and not network_stale:
+            return
+        
+        try:
+            with self.w3.batch_requests() as batch:
+                if balance_stale:
+                    batch.add(self.w3.eth.get_balance(self.wallet_info.address))
+                batch.add(self.w3.eth.block_number)
+                batch.add(self.w3.eth.gas_price)
+                responses = batch.execute()
+        except Exception as e:
+            logger.error(f"Batched RPC error: {e}")
+            return
+        
+        if balance_stale:
+            balance_eth = float(self.w3.from_wei(responses[0], 'ether'))
+            self.wallet_info.balance_eth = balance_eth
+            self.wallet_info.balance_usd = balance_eth * self.eth_price_usd
+            self._balance_checked_at = now
+        self._network_state = (now, responses[-2], responses[-1])
+    
     def get_transactions(self, limit: int = 10) -> List[TransactionInfo]:
         """Get recent transactions"""
         if not self.wallet_info:
             return []
         
+        cache_key = (self.wallet_info.address, limit)
+        cached = self._transactions_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < self.TRANSACTIONS_TTL:
+            return cached[1]
+        
         try:
             # Use Etherscan API for transaction history
             api_key = self.config.get("etherscan_api_key", "")
@@ -201,25 +279,29 @@ class MetaMaskIntegration:
                 "apikey": api_key
             }
             
-            response = requests.get(base_url, params=params)
-            data = response.json()
+            response = self._session.get(base_url, params=params, timeout=10)
+            data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
             
             if data["status"] == "1":
                 transactions = []
+                eth_price_usd = self.eth_price_usd
                 for tx in data["result"]:
+                    # Plain integer division instead of two Decimal from_wei round-trips
+                    amount_eth = int(tx["value"]) / WEI_PER_ETH
                     tx_info = TransactionInfo(
                         hash=tx["hash"],
                         from_address=tx["from"],
                         to_address=tx["to"],
-                        amount_eth=float(self.w3.from_wei(int(tx["value"]), 'ether')),
-                        amount_usd=float(self.w3.from_wei(int(tx["value"]), 'ether')) * self.eth_price_usd,
-                        gas_price=float(self.w3.from_wei(int(tx["gasPrice"]), 'gwei')),
+                        amount_eth=amount_eth,
+                        amount_usd=amount_eth * eth_price_usd,
+                        gas_price=int(tx["gasPrice"]) / WEI_PER_GWEI,
                         timestamp=int(tx["timeStamp"]),
                         status="confirmed" if tx["isError"] == "0" else "failed"
                     )
                     transactions.append(tx_info)
                 
                 self.transactions = transactions
+                self._transactions_cache[cache_key] = (time.monotonic(), transactions)
                 return transactions
             else:
                 logger.warning("Etherscan API error")
@@ -249,14 +331,20 @@ class MetaMaskIntegration:
         
         return mock_txs
     
-    def _update_eth_price(self):
-        """Update ETH price in USD"""
+    def _update_eth_price(self, force: bool = False):
+        """Update ETH price in USD, at most once per PRICE_TTL unless forced"""
+        now = time.monotonic()
+        if not force and self._price_checked_at is not None and now - self._price_checked_at < self.PRICE_TTL:
+            return
+        # Failed fetches are also rate limited, so an outage is not retried per call
+        self._price_checked_at = now
+        
         try:
             # Use CoinGecko API for price
             url = "https://api.coingecko.com/api/v3/simple/price"
             params = {"ids": "ethereum", "vs_currencies": "usd"}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self._session.get(url, params=params, timeout=10)
             data = response.json()
             
             self.eth_price_usd = data["ethereum"]["usd"]
@@ -330,8 +418,13 @@ class MetaMaskIntegration:
             return {"connected": False}
         
         try:
-            latest_block = self.w3.eth.block_number
-            gas_price = self.w3.eth.gas_price
+            state = self._network_state
+            if state is not None and time.monotonic() - state[0] < self.NETWORK_TTL:
+                _, latest_block, gas_price = state
+            else:
+                latest_block = self.w3.eth.block_number
+                gas_price = self.w3.eth.gas_price
+                self._network_state = (time.monotonic(), latest_block, gas_price)
             
             return {
                 "connected": True,
@@ -360,19 +453,14 @@ class WalletManager:
     
     def _start_auto_update(self):
         """Start automatic wallet updates"""
-        def update_loop():
-            while True:
-                try:
-                    if self.connected:
-                        self.metamask.get_balance()
-                        self.metamask._update_eth_price()
-                    time.sleep(30)  # Update every 30 seconds
-                except Exception as e:
-                    logger.error(f"Auto update error: {e}")
-                    time.sleep(60)
-        
-        update_thread = threading.Thread(target=update_loop, daemon=True)
-        update_thread.start()
+        # Pollers share one event loop thread with every other wallet manager;
+        # both calls are TTL-gated, so the intervals just match the TTLs
+        scheduler = get_poll_scheduler()
+        is_connected = lambda: self.connected
+        self._pollers = [
+            scheduler.add(self.metamask.get_balance, MetaMaskIntegration.BALANCE_TTL, is_connected),
+            scheduler.add(self.metamask._update_eth_price, MetaMaskIntegration.PRICE_TTL, is_connected),
+        ]
     
     def connect_wallet(self, address: str) -> bool:
         """Connect wallet and start management"""
@@ -393,6 +481,9 @@ class WalletManager:
         if not self.connected:
             return {"connected": False}
         
+        # One RPC round-trip for the balance, block number and gas price
+        self.metamask.refresh_chain_state()
+        
         return {
             "connected": True,
             "wallet": self.metamask.get_wallet_info(),
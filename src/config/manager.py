@@ -4,17 +4,133 @@ Handles loading, saving, and validating configuration
 """
 
 import configparser
+import copy
+import hashlib
+import io
 import json
 import os
-from typing import Dict, Any, Optional, Union
+import re
+import stat as stat_module
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from utils.logger import get_logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = get_logger(__name__)
 
+# Files with these extensions are read and written as legacy INI; everything
+# else is JSON
+_INI_SUFFIXES = ('.conf', '.ini', '.cfg')
+
+# Group settings by category for the on-disk layout
+_SECTIONS = {
+    "mining": [
+        "default_algorithm", "mining_mode", "difficulty", "target",
+        "cpu_threads", "gpu_devices", "intensity"
+    ],
+    "blockchain": [
+        "network", "infura_project_id", "etherscan_api_key", 
+        "mining_wallet_address", "auto_update_wallet",
+        "pool_address", "pool_fee", "payout_threshold"
+    ],
+    "profit_switching": [
+        "switch_strategy", "profit_update_interval", "switch_threshold",
+        "min_switch_interval", "enable_profit_switching"
+    ],
+    "monitoring": [
+        "performance_update_interval", "optimal_cpu_usage",
+        "optimal_temperature", "max_temperature"
+    ],
+    "pool": [
+        "pool_url", "pool_user", "pool_password"
+    ],
+    "algorithms": [
+        "sha256_batch_size", "ethash_cache_size", "ethash_dataset_size",
+        "randomx_dataset_size"
+    ]
+}
+
+# Shapes of INI values that parse as numbers
+_INT_RE = re.compile(r'[-+]?\d+\Z')
+_FLOAT_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\Z')
+# First characters of values that may still parse when the patterns miss
+_LADDER_START = frozenset('+-.{["')
+# Words float() or json.loads() accept, lowercased and without a sign
+_SPECIAL_LITERALS = frozenset({'null', 'nan', 'inf', 'infinity'})
+
+# Setting name -> section name, for placing settings in one lookup each
+_SECTION_MAP = {key: section_name for section_name, keys in _SECTIONS.items() for key in keys}
+
+# Parsed config files keyed by absolute path, tagged with the (mtime_ns, size)
+# they were parsed at so that edits on disk invalidate the entry
+_PARSED_CONFIG_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+
+def _parse_cached(path: str, parse: Callable[[], Dict[str, Any]],
+                  stat: Optional[os.stat_result] = None) -> Dict[str, Any]:
+    """
+    Return parse()'s result for path, re-running it only when the file changed
+    
+    stat may be passed in when the caller already has it. The returned dict
+    is shared with the cache and must not be mutated.
+    """
+    cache_key = os.path.abspath(path)
+    if stat is None:
+        stat = os.stat(cache_key)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    
+    cached = _PARSED_CONFIG_CACHE.get(cache_key)
+    if cached is None or cached[0] != signature:
+        cached = (signature, parse())
+        _PARSED_CONFIG_CACHE[cache_key] = cached
+    return cached[1]
+
+
+def _invalidate_cached(path: str):
+    """Drop the cached parse of path after writing it"""
+    _PARSED_CONFIG_CACHE.pop(os.path.abspath(path), None)
+
+
+def _copy_ownership(fd: int, existing: os.stat_result):
+    """Give an open replacement file the mode and, where permitted, owner of the original"""
+    if not hasattr(os, "fchmod"):
+        return  # Windows: no POSIX modes or owners to keep
+    os.fchmod(fd, stat_module.S_IMODE(existing.st_mode))
+    if hasattr(os, "fchown"):
+        try:
+            os.fchown(fd, existing.st_uid, existing.st_gid)
+        except PermissionError:
+            pass  # only root may give files away; the mode is what matters
+
 
-@dataclass
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to indented JSON, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+# dataclass(slots=True) needs Python 3.10; older interpreters keep __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class MiningConfig:
     # Core mining settings
     default_algorithm: str = "sha256"
@@ -54,15 +170,37 @@ class MiningConfig:
     def __post_init__(self):
         if self.gpu_devices is None:
             self.gpu_devices = []
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow field copy; cheaper than asdict() since no field is a dataclass"""
+        config_dict = {name: getattr(self, name) for name in _CONFIG_FIELDS}
+        if isinstance(self.gpu_devices, list):
+            config_dict["gpu_devices"] = list(self.gpu_devices)
+        return config_dict
+
+
+# Accepted values for the enumerated settings
+_VALID_ALGORITHMS = frozenset({"sha256", "ethash", "randomx"})
+_VALID_MODES = frozenset({"solo", "pool", "smart"})
+_VALID_STRATEGIES = frozenset({"immediate", "gradual", "threshold", "predictive"})
+
+# Field names in declaration order, and the set update_config/batch_update
+# accept: a set lookup instead of hasattr
+_CONFIG_FIELDS = tuple(field.name for field in fields(MiningConfig))
+_CONFIG_KEYS = frozenset(_CONFIG_FIELDS)
 
 
 class ConfigManager:
     """Advanced configuration management system"""
     
     def __init__(self, config_path: Optional[str] = None):
-        self.config_path = config_path or "config/default.conf"
+        self.config_path = config_path or "config/default.json"
         self.config = MiningConfig()
-        self._config_format = "ini"  # ini, json
+        self._config_format = self._detect_format(self.config_path)  # json, ini
+        self._validation_suspended = 0
+        
+        # Files this manager wrote: path -> (content digest, (mtime_ns, size))
+        self._written_files: Dict[str, Tuple[bytes, Tuple[int, int]]] = {}
         
         logger.info(f"Config Manager initialized with path: {self.config_path}")
     
@@ -71,19 +209,21 @@ class ConfigManager:
         if config_path:
             self.config_path = config_path
         
+        # Determine file format
+        self._config_format = self._detect_format(self.config_path)
+        
         if not os.path.exists(self.config_path):
             logger.warning(f"Config file not found: {self.config_path}. Creating default.")
-            self.save_config()
-            return self._load_ini_config()  # Return raw config dict
+            if self.save_config():
+                try:
+                    return self._read_config_file()  # Return raw config dict
+                except Exception as e:
+                    logger.error(f"Error reading default config: {e}")
+            # Unwritable location: hand back the defaults without a file
+            return self._group_by_section(MiningConfig().to_dict())
         
         try:
-            # Determine file format
-            if self.config_path.endswith('.json'):
-                self._config_format = "json"
-                config_dict = self._load_json_config()
-            else:
-                self._config_format = "ini"
-                config_dict = self._load_ini_config()
+            config_dict = self._read_config_file()
             
             # Update config object
             self._update_config_from_dict(config_dict)
@@ -97,7 +237,22 @@ class ConfigManager:
         except Exception as e:
             logger.error(f"Error loading config: {e}")
             logger.info("Using default configuration")
-            return self._load_ini_config()  # Return raw config dict
+            return self._group_by_section(MiningConfig().to_dict())  # Return raw config dict
+    
+    @staticmethod
+    def _detect_format(config_path: str) -> str:
+        """JSON unless the path has a legacy INI extension"""
+        return "ini" if config_path.lower().endswith(_INI_SUFFIXES) else "json"
+    
+    def _read_config_file(self) -> Dict[str, Any]:
+        """Parse the config file, reusing the last parse if it is unchanged on disk"""
+        if self._config_format == "json":
+            parsed = _parse_cached(self.config_path, self._load_json_config)
+        else:
+            parsed = _parse_cached(self.config_path, self._load_ini_config)
+        
+        # Callers are free to mutate what they get back
+        return copy.deepcopy(parsed)
     
     def save_config(self, config_path: Optional[str] = None) -> bool:
         """Save configuration to file"""
@@ -106,9 +261,9 @@ class ConfigManager:
         
         try:
             # Ensure directory exists
-            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+            os.makedirs(os.path.dirname(self.config_path) or ".", exist_ok=True)
             
-            config_dict = asdict(self.config)
+            config_dict = self.config.to_dict()
             
             if self._config_format == "json":
                 self._save_json_config(config_dict)
@@ -128,19 +283,26 @@ class ConfigManager:
     
     def get_config_dict(self) -> Dict[str, Any]:
         """Get configuration as dictionary"""
-        return asdict(self.config)
+        return self.config.to_dict()
     
     def update_config(self, updates: Dict[str, Any]) -> bool:
         """Update configuration with new values"""
+        return self.batch_update([updates])
+    
+    def batch_update(self, updates_list: List[Dict[str, Any]]) -> bool:
+        """Apply several update dicts in order, validating once at the end"""
         try:
-            for key, value in updates.items():
-                if hasattr(self.config, key):
-                    setattr(self.config, key, value)
-                else:
-                    logger.warning(f"Unknown config key: {key}")
+            config = self.config
+            for updates in updates_list:
+                for key, value in updates.items():
+                    if key in _CONFIG_KEYS:
+                        setattr(config, key, value)
+                    else:
+                        logger.warning(f"Unknown config key: {key}")
             
             # Validate after update
-            self._validate_config()
+            if not self._validation_suspended:
+                self._validate_config()
             
             logger.info("Configuration updated")
             return True
@@ -149,6 +311,17 @@ class ConfigManager:
             logger.error(f"Error updating config: {e}")
             return False
     
+    @contextmanager
+    def suspend_validation(self) -> Iterator["ConfigManager"]:
+        """Defer validation of updates made inside the block to a single pass on exit"""
+        self._validation_suspended += 1
+        try:
+            yield self
+        finally:
+            self._validation_suspended -= 1
+            if not self._validation_suspended:
+                self._validate_config()
+    
     def reset_to_defaults(self):
         """Reset configuration to default values"""
         self.config = MiningConfig()
@@ -156,133 +329,166 @@ class ConfigManager:
     
     def _load_ini_config(self) -> Dict[str, Any]:
         """Load configuration from INI file"""
-        parser = configparser.ConfigParser()
-        parser.read(self.config_path)
-        
+        # Our files are flat key = value sections, so a line scan does the
+        # job without configparser's per-line regex dispatch and interpolation
         config_dict = {}
+        section_dict = None
         
-        # Parse each section
-        for section_name in parser.sections():
-            section_dict = {}
-            for key, value in parser[section_name].items():
-                # Try to parse as different types
-                section_dict[key] = self._parse_config_value(value)
-            config_dict[section_name] = section_dict
+        for line in Path(self.config_path).read_text().splitlines():
+            line = line.strip()
+            if not line or line[0] in '#;':
+                continue
+            
+            if line[0] == '[' and line[-1] == ']':
+                section_dict = config_dict.setdefault(line[1:-1].strip(), {})
+                continue
+            
+            key, sep, value = line.partition('=')
+            if not sep or section_dict is None:
+                logger.warning(f"Ignoring malformed config line: {line}")
+                continue
+            
+            # configparser lowercased option names; keep that behaviour
+            section_dict[key.strip().lower()] = self._parse_config_value(value.strip())
         
         return config_dict
     
     def _load_json_config(self) -> Dict[str, Any]:
         """Load configuration from JSON file"""
-        with open(self.config_path, 'r') as f:
-            return json.load(f)
+        # orjson yields typed values directly, with no per-value re-parsing
+        return _json_loads(Path(self.config_path).read_bytes())
+    
+    @staticmethod
+    def _group_by_section(config_dict: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Arrange flat settings into the sectioned on-disk layout"""
+        grouped = {section_name: {} for section_name in _SECTIONS}
+        for key, value in config_dict.items():
+            section_name = _SECTION_MAP.get(key)
+            if section_name is not None:
+                grouped[section_name][key] = value
+        return grouped
     
     def _save_ini_config(self, config_dict: Dict[str, Any]):
         """Save configuration to INI file"""
         parser = configparser.ConfigParser()
         
-        # Group settings by category
-        sections = {
-            "mining": [
-                "default_algorithm", "mining_mode", "difficulty", "target",
-                "cpu_threads", "gpu_devices", "intensity"
-            ],
-            "blockchain": [
-                "network", "infura_project_id", "etherscan_api_key", 
-                "mining_wallet_address", "auto_update_wallet",
-                "pool_address", "pool_fee", "payout_threshold"
-            ],
-            "profit_switching": [
-                "switch_strategy", "profit_update_interval", "switch_threshold",
-                "min_switch_interval", "enable_profit_switching"
-            ],
-            "monitoring": [
-                "performance_update_interval", "optimal_cpu_usage",
-                "optimal_temperature", "max_temperature"
-            ],
-            "pool": [
-                "pool_url", "pool_user", "pool_password"
-            ],
-            "algorithms": [
-                "sha256_batch_size", "ethash_cache_size", "ethash_dataset_size",
-                "randomx_dataset_size"
-            ]
-        }
-        
-        # Create sections and add settings
-        for section_name, keys in sections.items():
+        # Create sections, then place each setting with one lookup
+        for section_name in _SECTIONS:
             parser.add_section(section_name)
-            for key in keys:
-                if key in config_dict:
-                    value = config_dict[key]
-                    if isinstance(value, (list, dict)):
-                        value = json.dumps(value)
-                    parser.set(section_name, key, str(value))
+        for key, value in config_dict.items():
+            section_name = _SECTION_MAP.get(key)
+            if section_name is None:
+                continue
+            if isinstance(value, (list, dict)):
+                value = json.dumps(value)
+            parser.set(section_name, key, str(value))
         
         # Write to file
-        with open(self.config_path, 'w') as f:
-            parser.write(f)
+        buffer = io.StringIO()
+        parser.write(buffer)
+        self._write_file(self.config_path, buffer.getvalue().encode())
     
     def _save_json_config(self, config_dict: Dict[str, Any]):
         """Save configuration to JSON file"""
-        with open(self.config_path, 'w') as f:
-            json.dump(config_dict, f, indent=2)
+        self._write_file(self.config_path, _json_dumps(self._group_by_section(config_dict)))
     
-    def _update_config_from_dict(self, config_dict: Dict[str, Any]):
-        """Update config object from dictionary"""
-        # Handle INI format (nested sections)
-        if "mining" in config_dict:
-            for key, value in config_dict["mining"].items():
-                if hasattr(self.config, key):
-                    setattr(self.config, key, value)
+    def _write_file(self, path: str, payload: bytes) -> bool:
+        """
+        Atomically replace path with payload, skipping unchanged content
         
-        if "profit_switching" in config_dict:
-            for key, value in config_dict["profit_switching"].items():
-                if hasattr(self.config, key):
-                    setattr(self.config, key, value)
+        The write is skipped when this manager last wrote the same bytes and
+        the file has not been touched since. Returns True if it was written.
+        """
+        key = os.path.abspath(path)
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
         
-        if "monitoring" in config_dict:
-            for key, value in config_dict["monitoring"].items():
-                if hasattr(self.config, key):
-                    setattr(self.config, key, value)
+        written = self._written_files.get(key)
+        if written is not None and written[0] == digest:
+            try:
+                stat = os.stat(key)
+                if (stat.st_mtime_ns, stat.st_size) == written[1]:
+                    logger.debug(f"Unchanged, not rewriting {path}")
+                    return False
+            except OSError:
+                pass
         
-        if "pool" in config_dict:
-            for key, value in config_dict["pool"].items():
-                if hasattr(self.config, key):
-                    setattr(self.config, key, value)
+        # Write beside the target and rename, so readers never see a torn file.
+        # mkstemp gives each save, in any thread or process, its own temp file,
+        # created exclusively with mode 0600
+        try:
+            existing = os.stat(key)
+        except FileNotFoundError:
+            existing = None
+        fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(key)}.",
+                                        suffix=".tmp", dir=os.path.dirname(key))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if existing is not None:
+                    # The replace must not change the mode or owner of a file
+                    # holding pool passwords and API keys
+                    _copy_ownership(f.fileno(), existing)
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, key)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        _invalidate_cached(key)
         
-        if "algorithms" in config_dict:
-            for key, value in config_dict["algorithms"].items():
-                if hasattr(self.config, key):
-                    setattr(self.config, key, value)
+        stat = os.stat(key)
+        self._written_files[key] = (digest, (stat.st_mtime_ns, stat.st_size))
+        return True
+    
+    def _update_config_from_dict(self, config_dict: Dict[str, Any]):
+        """Update config object from dictionary"""
+        config = self.config
         
-        # Handle flat JSON format
-        for key, value in config_dict.items():
-            if hasattr(self.config, key) and not isinstance(value, dict):
-                setattr(self.config, key, value)
+        if any(section_name in config_dict for section_name in _SECTIONS):
+            # Sectioned layout (INI, and JSON as saved by this manager)
+            for section_name in _SECTIONS:
+                section = config_dict.get(section_name)
+                if not isinstance(section, dict):
+                    continue
+                for key, value in section.items():
+                    if key in _CONFIG_KEYS:
+                        setattr(config, key, value)
+        else:
+            # Flat layout
+            for key, value in config_dict.items():
+                if key in _CONFIG_KEYS and not isinstance(value, dict):
+                    setattr(config, key, value)
     
     def _parse_config_value(self, value: str) -> Union[str, int, float, bool, list]:
         """Parse configuration value to appropriate type"""
-        # Try boolean
-        if value.lower() in ('true', 'false'):
-            return value.lower() == 'true'
+        # Dispatch on the value's shape instead of trying parsers until one
+        # stops raising
+        lowered = value.lower()
+        if lowered in ('true', 'false'):
+            return lowered == 'true'
         
-        # Try integer
-        try:
+        if value[:1] in ('{', '[', '"'):
+            try:
+                return _json_loads(value)
+            except ValueError:
+                pass
+        elif _INT_RE.match(value):
             return int(value)
-        except ValueError:
-            pass
-        
-        # Try float
-        try:
+        elif _FLOAT_RE.match(value):
             return float(value)
-        except ValueError:
-            pass
         
-        # Try JSON (for lists and dicts)
-        try:
-            return json.loads(value)
-        except ValueError:
-            pass
+        # Numeric-looking values the patterns reject (1_000, nan, -inf, null,
+        # or JSON orjson refuses) still get the full int/float/JSON ladder
+        if (value[:1] in _LADDER_START or value[:1].isdigit()
+                or lowered.lstrip('+-') in _SPECIAL_LITERALS):
+            for parse in (int, float, json.loads):
+                try:
+                    return parse(value)
+                except ValueError:
+                    pass
         
         # Default to string
         return value
@@ -290,20 +496,17 @@ class ConfigManager:
     def _validate_config(self):
         """Validate configuration values"""
         # Validate algorithm
-        valid_algorithms = ["sha256", "ethash", "randomx"]
-        if self.config.default_algorithm not in valid_algorithms:
+        if self.config.default_algorithm not in _VALID_ALGORITHMS:
             logger.warning(f"Invalid algorithm: {self.config.default_algorithm}")
             self.config.default_algorithm = "sha256"
         
         # Validate mining mode
-        valid_modes = ["solo", "pool", "smart"]
-        if self.config.mining_mode not in valid_modes:
+        if self.config.mining_mode not in _VALID_MODES:
             logger.warning(f"Invalid mining mode: {self.config.mining_mode}")
             self.config.mining_mode = "smart"
         
         # Validate switch strategy
-        valid_strategies = ["immediate", "gradual", "threshold", "predictive"]
-        if self.config.switch_strategy not in valid_strategies:
+        if self.config.switch_strategy not in _VALID_STRATEGIES:
             logger.warning(f"Invalid switch strategy: {self.config.switch_strategy}")
             self.config.switch_strategy = "threshold"
         
@@ -330,12 +533,11 @@ class ConfigManager:
             profile_data = {
                 "name": profile_name,
                 "description": description,
-                "config": asdict(self.config),
+                "config": self.config.to_dict(),
                 "created_at": str(os.path.getmtime(self.config_path) if os.path.exists(self.config_path) else 0)
             }
             
-            with open(profile_path, 'w') as f:
-                json.dump(profile_data, f, indent=2)
+            self._write_file(profile_path, _json_dumps(profile_data))
             
             logger.info(f"Profile created: {profile_name}")
             return True
@@ -353,10 +555,9 @@ class ConfigManager:
                 logger.error(f"Profile not found: {profile_name}")
                 return False
             
-            with open(profile_path, 'r') as f:
-                profile_data = json.load(f)
+            profile_data = _parse_cached(profile_path, lambda: _json_loads(Path(profile_path).read_bytes()))
             
-            config_dict = profile_data.get("config", {})
+            config_dict = copy.deepcopy(profile_data.get("config", {}))
             self._update_config_from_dict(config_dict)
             self._validate_config()
             
@@ -372,15 +573,24 @@ class ConfigManager:
         profiles = {}
         profiles_dir = "config/profiles"
         
-        if os.path.exists(profiles_dir):
-            for filename in os.listdir(profiles_dir):
-                if filename.endswith('.json'):
-                    profile_name = filename[:-5]  # Remove .json extension
-                    try:
-                        with open(os.path.join(profiles_dir, filename), 'r') as f:
-                            profile_data = json.load(f)
-                            profiles[profile_name] = profile_data.get("description", "")
-                    except:
-                        profiles[profile_name] = "Error loading description"
+        if not os.path.isdir(profiles_dir):
+            return profiles
+        
+        # scandir yields each entry's path and type without extra lookups, and
+        # unchanged profiles are served from the parse cache
+        with os.scandir(profiles_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json'):
+                    continue
+                profile_name = entry.name[:-5]  # Remove .json extension
+                try:
+                    if not entry.is_file():
+                        continue
+                    profile_data = _parse_cached(
+                        entry.path, lambda: _json_loads(Path(entry.path).read_bytes()), entry.stat()
+                    )
+                    profiles[profile_name] = profile_data.get("description", "")
+                except Exception:
+                    profiles[profile_name] = "Error loading description"
         
         return profiles
@@ -7,13 +7,11 @@ import threading
 import time
 import hashlib
 import random
+from collections import namedtuple
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
-from algorithms.factory import AlgorithmFactory
-from monitoring.performance import PerformanceMonitor
-from monitoring.profit_switcher import ProfitSwitcher
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -27,6 +25,10 @@ class MiningMode(Enum):
 
 @dataclass
 class MiningStats:
+    # No field has a default, so plain __slots__ works on every Python version
+    __slots__ = ("hashrate", "accepted_shares", "rejected_shares", "uptime",
+                 "power_usage", "temperature", "efficiency")
+    
     hashrate: float
     accepted_shares: int
     rejected_shares: int
@@ -36,6 +38,14 @@ class MiningStats:
     efficiency: float
 
 
+# Immutable view of MiningStats handed to readers: one C-level tuple
+# allocation instead of a dataclass __init__
+StatsSnapshot = namedtuple(
+    "StatsSnapshot",
+    "hashrate accepted_shares rejected_shares uptime power_usage temperature efficiency"
+)
+
+
 class AdvancedMiner:
     """Advanced mining system with intelligent features"""
     
@@ -44,14 +54,23 @@ class AdvancedMiner:
         self.running = False
         self.paused = False
         
-        # Initialize components
-        self.algorithm_factory = AlgorithmFactory()
-        self.performance_monitor = PerformanceMonitor(config)
-        self.profit_switcher = ProfitSwitcher(config)
+        # Set while mining may proceed; the mining loop blocks on it when paused
+        self._pause_event = threading.Event()
+        self._pause_event.set()
         
-        # Mining state
+        # Components are created on first use, so short-lived miners (status
+        # queries, the dashboard) never import or build them
+        self._algorithm_factory = None
+        self._performance_monitor = None
+        self._profit_switcher = None
+        
+        # Mining state. Stats are lock-free: share counters and uptime have a
+        # single writer (the mining thread), and the stats thread publishes
+        # (hashrate, power_usage, temperature, efficiency) as one tuple and
+        # mirrors those fields on self.stats
         self.current_algorithm = None
         self.mining_threads = []
+        self._perf = (0.0, 0.0, 0.0, 0.0)
         self.stats = MiningStats(
             hashrate=0.0,
             accepted_shares=0,
@@ -63,11 +82,51 @@ class AdvancedMiner:
         )
         
         # Threading locks
-        self._stats_lock = threading.Lock()
         self._control_lock = threading.Lock()
+        self._components_lock = threading.Lock()
+        
+        # getrandbits is a single C call, unlike the Python-level randint
+        self._rand_bits = random.getrandbits
+        
+        # The switcher's choice only changes when its data refreshes, which
+        # it signals; the TTL is a fallback for time-based switch rules
+        self._best_algorithm = None
+        self._best_algorithm_checked_at = float("-inf")
         
         logger.info("Advanced Miner initialized")
     
+    @property
+    def algorithm_factory(self):
+        """Algorithm factory, created on first access"""
+        if self._algorithm_factory is None:
+            with self._components_lock:
+                if self._algorithm_factory is None:
+                    from algorithms.factory import AlgorithmFactory
+                    self._algorithm_factory = AlgorithmFactory()
+        return self._algorithm_factory
+    
+    @property
+    def performance_monitor(self):
+        """Performance monitor, created on first access"""
+        if self._performance_monitor is None:
+            with self._components_lock:
+                if self._performance_monitor is None:
+                    from monitoring.performance import PerformanceMonitor
+                    self._performance_monitor = PerformanceMonitor(self.config)
+        return self._performance_monitor
+    
+    @property
+    def profit_switcher(self):
+        """Profit switcher, created on first access"""
+        if self._profit_switcher is None:
+            with self._components_lock:
+                if self._profit_switcher is None:
+                    from monitoring.profit_switcher import ProfitSwitcher
+                    profit_switcher = ProfitSwitcher(self.config)
+                    profit_switcher.add_update_callback(self._invalidate_best_algorithm)
+                    self._profit_switcher = profit_switcher
+        return self._profit_switcher
+    
     def start(self):
         """Start the mining operation"""
         with self._control_lock:
@@ -115,43 +174,59 @@ class AdvancedMiner:
     def pause(self):
         """Pause mining temporarily"""
         self.paused = True
+        self._pause_event.clear()
         logger.info("Mining paused")
     
     def resume(self):
         """Resume mining after pause"""
         self.paused = False
+        self._pause_event.set()
         logger.info("Mining resumed")
     
     def _mining_loop(self):
         """Main mining loop"""
-        start_time = time.time()
+        start_time = time.monotonic()
         
         while self.running:
-            if self.paused:
-                time.sleep(1)
+            if not self._pause_event.is_set():
+                # Wakes as soon as resume() is called; the timeout only
+                # bounds how long stop() waits on a paused miner
+                self._pause_event.wait(1)
                 continue
             
             try:
                 # Get best algorithm from profit switcher
-                best_algorithm = self.profit_switcher.get_best_algorithm()
+                best_algorithm = self._get_best_algorithm()
                 
-                if best_algorithm != self.current_algorithm:
+                current = self.current_algorithm
+                if current is None or best_algorithm != current.name:
                     self._switch_algorithm(best_algorithm)
                 
                 if self.current_algorithm:
-                    # Mine one block/share
+                    # Mine one block/share; the mining call itself paces the loop
                     self._mine_iteration()
-                
-                # Small delay to prevent CPU overload
-                time.sleep(0.01)
+                else:
+                    # No algorithm could be started; retry the switch later
+                    time.sleep(1)
                 
             except Exception as e:
                 logger.error(f"Error in mining loop: {e}")
                 time.sleep(1)
         
         # Update final uptime
-        with self._stats_lock:
-            self.stats.uptime = time.time() - start_time
+        self.stats.uptime = time.monotonic() - start_time
+    
+    def _get_best_algorithm(self) -> str:
+        """Best algorithm name, re-queried after a profit update or the TTL"""
+        now = time.monotonic()
+        if now - self._best_algorithm_checked_at > self.config.get("profit_update_interval", 60):
+            self._best_algorithm = self.profit_switcher.get_best_algorithm()
+            self._best_algorithm_checked_at = now
+        return self._best_algorithm
+    
+    def _invalidate_best_algorithm(self):
+        """Profit data changed: re-query the switcher on the next iteration"""
+        self._best_algorithm_checked_at = float("-inf")
     
     def _mine_iteration(self):
         """Execute one mining iteration"""
@@ -177,22 +252,22 @@ class AdvancedMiner:
     
     def _generate_work_data(self) -> Dict[str, Any]:
         """Generate work data for mining"""
+        rand_bits = self._rand_bits
         return {
-            "data": f"block_{int(time.time())}_{random.randint(0, 1000000)}",
+            "data": f"block_{int(time.time())}_{rand_bits(20)}",
             "difficulty": self.config.get("difficulty", 1.0),
             "target": self.config.get("target", "00000000"),
-            "nonce": random.randint(0, 2**32 - 1)
+            "nonce": rand_bits(32)
         }
     
     def _process_share(self, result: Dict[str, Any]):
         """Process a found share/block"""
-        with self._stats_lock:
-            if result.get("valid", False):
-                self.stats.accepted_shares += 1
-                logger.info(f"Valid share found! Nonce: {result.get('nonce')}")
-            else:
-                self.stats.rejected_shares += 1
-                logger.warning(f"Invalid share rejected: {result.get('nonce')}")
+        if result.get("valid", False):
+            self.stats.accepted_shares += 1
+            logger.info(f"Valid share found! Nonce: {result.get('nonce')}")
+        else:
+            self.stats.rejected_shares += 1
+            logger.warning(f"Invalid share rejected: {result.get('nonce')}")
     
     def _switch_algorithm(self, new_algorithm_name: str):
         """Switch to a different mining algorithm"""
@@ -219,25 +294,36 @@ class AdvancedMiner:
     
     def _stats_loop(self):
         """Statistics collection loop"""
+        next_log = time.monotonic() + 30
+        
         while self.running:
             try:
                 # Update performance metrics
                 perf_data = self.performance_monitor.get_current_stats()
                 
-                with self._stats_lock:
-                    self.stats.hashrate = perf_data.get("hashrate", 0.0)
-                    self.stats.power_usage = perf_data.get("power_usage", 0.0)
-                    self.stats.temperature = perf_data.get("temperature", 0.0)
-                    
-                    # Calculate efficiency (hashes per watt)
-                    if self.stats.power_usage > 0:
-                        self.stats.efficiency = self.stats.hashrate / self.stats.power_usage
-                    else:
-                        self.stats.efficiency = 0.0
+                hashrate = perf_data.get("hashrate", 0.0)
+                power_usage = perf_data.get("power_usage", 0.0)
+                temperature = perf_data.get("temperature", 0.0)
+                
+                # Calculate efficiency (hashes per watt)
+                efficiency = hashrate / power_usage if power_usage > 0 else 0.0
+                
+                # Publish all four at once; readers never see a mix of updates
+                self._perf = (hashrate, power_usage, temperature, efficiency)
+                
+                # Mirror them on self.stats for code that reads it directly;
+                # get_stats() reads the consistent tuple above
+                stats = self.stats
+                stats.hashrate = hashrate
+                stats.power_usage = power_usage
+                stats.temperature = temperature
+                stats.efficiency = efficiency
                 
                 # Log stats every 30 seconds
-                if int(time.time()) % 30 == 0:
+                now = time.monotonic()
+                if now >= next_log:
                     self._log_stats()
+                    next_log = now + 30
                 
                 time.sleep(1)
                 
@@ -247,20 +333,22 @@ class AdvancedMiner:
     
     def _log_stats(self):
         """Log current mining statistics"""
-        with self._stats_lock:
-            logger.info(
-                f"Stats - Hashrate: {self.stats.hashrate:.2f} H/s | "
-                f"Accepted: {self.stats.accepted_shares} | "
-                f"Rejected: {self.stats.rejected_shares} | "
-                f"Power: {self.stats.power_usage:.1f}W | "
-                f"Temp: {self.stats.temperature:.1f}°C | "
-                f"Efficiency: {self.stats.efficiency:.2f} H/W"
-            )
+        stats = self.get_stats()
+        logger.info(
+            f"Stats - Hashrate: {stats.hashrate:.2f} H/s | "
+            f"Accepted: {stats.accepted_shares} | "
+            f"Rejected: {stats.rejected_shares} | "
+            f"Power: {stats.power_usage:.1f}W | "
+            f"Temp: {stats.temperature:.1f}°C | "
+            f"Efficiency: {stats.efficiency:.2f} H/W"
+        )
     
-    def get_stats(self) -> MiningStats:
+    def get_stats(self) -> StatsSnapshot:
         """Get current mining statistics"""
-        with self._stats_lock:
-            return MiningStats(**self.stats.__dict__)
+        hashrate, power_usage, temperature, efficiency = self._perf
+        stats = self.stats
+        return StatsSnapshot(hashrate, stats.accepted_shares, stats.rejected_shares,
+                             stats.uptime, power_usage, temperature, efficiency)
     
     def is_running(self) -> bool:
         """Check if mining is running"""
@@ -3,9 +3,18 @@ Dashboard Module
 Web-based monitoring and control interface
 """
 
-from .app import MiningDashboard, start_dashboard
-
 __all__ = [
     "MiningDashboard",
     "start_dashboard"
 ]
+
+
+def __getattr__(name):
+    # Import the Flask app on first use so importing the package stays cheap
+    if name in __all__:
+        from . import app
+        value = getattr(app, name)
+        # Bind the name so later lookups skip this hook
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
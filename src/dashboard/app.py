@@ -3,25 +3,119 @@ Web Dashboard
 Real-time monitoring dashboard for the mining system
 """
 
+import gzip
+import hashlib
 import json
 import time
 import random
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, request
 from flask_socketio import SocketIO, emit
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import threading
+from collections import namedtuple
 
 from utils.logger import get_logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# python-socketio's msgpack serializer needs the msgpack package
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 logger = get_logger(__name__)
 
+if ORJSON_AVAILABLE:
+    # NON_STR_KEYS matches the stdlib's handling of e.g. int keys in configs
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _json_dumps(payload: Any) -> bytes:
+    """Serialize to JSON bytes, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, option=_ORJSON_OPTIONS)
+    return json.dumps(payload).encode()
+
+
+def _json_response(payload: Any, status: int = 200) -> Response:
+    """JSON response from a payload or already serialized bytes"""
+    body = payload if isinstance(payload, bytes) else _json_dumps(payload)
+    return Response(body, status=status, mimetype='application/json')
+
+
+# Snapshot type MockMiner.get_stats returns, with AdvancedMiner's field names
+_MockStats = namedtuple(
+    "MockStats",
+    "hashrate accepted_shares rejected_shares uptime power_usage temperature efficiency"
+)
+
+
+def _stats_dict(stats: Any) -> Dict[str, Any]:
+    """Plain dict of a miner's stats snapshot, for serialization"""
+    if isinstance(stats, dict):
+        return stats
+    # A literal beats namedtuple._asdict() for this fixed set of fields
+    return {
+        "hashrate": stats.hashrate,
+        "accepted_shares": stats.accepted_shares,
+        "rejected_shares": stats.rejected_shares,
+        "uptime": stats.uptime,
+        "power_usage": stats.power_usage,
+        "temperature": stats.temperature,
+        "efficiency": stats.efficiency
+    }
+
+
+# Constant parts of the mock API payloads, built once and serialized as-is.
+# Never mutate these: handlers share them across requests.
+_MOCK_SYSTEM_INFO = {
+    "platform": "Linux",
+    "processor": "Mock CPU",
+    "cpu_count": 8,
+    "memory_total": 16777216000,
+    "gpu_count": 0
+}
+# (seconds ago, from, to)
+_MOCK_SWITCHES = ((3600, "ethash", "sha256"), (7200, "randomx", "ethash"))
+
+
+def _etag(body: bytes) -> str:
+    """Strong validator for a response body"""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+def _etag_response(body: bytes, etag: str) -> Response:
+    """JSON response carrying etag, or an empty 304 if the client has it already"""
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = _json_response(body)
+    response.set_etag(etag)
+    return response
+
 
 class MockMiner:
     """Mock miner for standalone dashboard mode"""
     
+    # Size of the pre-drawn noise ring; a power of two so indexing is a mask
+    NOISE_SIZE = 4096
+    
     def __init__(self):
         self.running = False
         self.start_time = time.time()
+        
+        # Draw the random walk steps (hashrate, power, temperature) once,
+        # then cycle through them instead of calling the RNG on every poll
+        uniform = random.uniform
+        self._noise = [(uniform(-10, 10), uniform(-5, 5), uniform(-1, 1))
+                       for _ in range(self.NOISE_SIZE)]
+        self._noise_index = 0
         self.stats = {
             "hashrate": random.uniform(800, 1200),
             "accepted_shares": random.randint(100, 500),
@@ -34,11 +128,15 @@ class MockMiner:
     
     def get_stats(self):
         """Get mock statistics"""
-        self.stats["uptime"] = time.time() - self.start_time
-        self.stats["hashrate"] += random.uniform(-10, 10)
-        self.stats["power_usage"] += random.uniform(-5, 5)
-        self.stats["temperature"] += random.uniform(-1, 1)
-        return type('Stats', (), self.stats)()
+        d_hashrate, d_power, d_temperature = self._noise[self._noise_index & (self.NOISE_SIZE - 1)]
+        self._noise_index += 1
+        
+        stats = self.stats
+        stats["uptime"] = time.time() - self.start_time
+        stats["hashrate"] += d_hashrate
+        stats["power_usage"] += d_power
+        stats["temperature"] += d_temperature
+        return _MockStats(**stats)
     
     def start(self):
         self.running = True
@@ -62,49 +160,83 @@ class MiningDashboard:
         self.config = config or {}
         self.app = Flask(__name__)
         self.app.config['SECRET_KEY'] = 'mining_dashboard_secret'
-        self.socketio = SocketIO(self.app, cors_allowed_origins="*")
         
-        # Dashboard state
+        # Binary msgpack frames are smaller and cheaper to encode than JSON
+        # text; the page loads the matching client parser
+        self.use_msgpack = MSGPACK_AVAILABLE and self.config.get("dashboard_msgpack", True)
+        socketio_options = {"serializer": "msgpack"} if self.use_msgpack else {}
+        self.socketio = SocketIO(self.app, cors_allowed_origins="*", **socketio_options)
+        
+        # The page only varies with the msgpack flag: render and compress it
+        # once instead of running Jinja on every load
+        page = self.app.jinja_env.from_string(DASHBOARD_HTML).render(msgpack=self.use_msgpack)
+        self._page = page.encode('utf-8')
+        self._page_gzip = gzip.compress(self._page, 9)
+        
+        # Dashboard state; the event is set while any client is connected
         self.connected_clients = 0
-        self.update_interval = config.get("dashboard_update_interval", 1.0) if config else 1.0
+        self._clients_lock = threading.Lock()
+        self._clients_active = threading.Event()
+        self.update_interval = self.config.get("dashboard_update_interval", 1.0)
+        
+        # Serialized API bodies reused until the next update interval:
+        # route name -> (expiry on the monotonic clock, body, ETag)
+        self._response_cache: Dict[str, Tuple[float, bytes, str]] = {}
         
         self._setup_routes()
         self._setup_socketio_events()
         
         logger.info("Mining Dashboard initialized")
     
+    def _cached_response(self, key: str) -> Optional[Response]:
+        """Response for key from the cache, if it has not expired"""
+        entry = self._response_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return _etag_response(entry[1], entry[2])
+        return None
+    
+    def _cache_response(self, key: str, payload: Dict[str, Any]) -> Response:
+        """Serialize payload, keep it for one update interval and return it"""
+        body = _json_dumps(payload)
+        etag = _etag(body)
+        self._response_cache[key] = (time.monotonic() + self.update_interval, body, etag)
+        return _etag_response(body, etag)
+    
     def _setup_routes(self):
         """Setup Flask routes"""
         
         @self.app.route('/')
         def index():
             """Main dashboard page"""
-            return render_template('dashboard.html')
+            headers = {'Cache-Control': 'public, max-age=3600', 'Vary': 'Accept-Encoding'}
+            if 'gzip' in request.accept_encodings:
+                headers['Content-Encoding'] = 'gzip'
+                return Response(self._page_gzip, mimetype='text/html', headers=headers)
+            return Response(self._page, mimetype='text/html', headers=headers)
         
         @self.app.route('/api/stats')
         def get_stats():
             """Get current mining statistics"""
             try:
-                stats = self.miner.get_stats()
-                return jsonify({
+                response = self._cached_response('stats')
+                if response is not None:
+                    return response
+                
+                return self._cache_response('stats', {
                     "success": True,
-                    "data": {
-                        "hashrate": stats.hashrate,
-                        "accepted_shares": stats.accepted_shares,
-                        "rejected_shares": stats.rejected_shares,
-                        "uptime": stats.uptime,
-                        "power_usage": stats.power_usage,
-                        "temperature": stats.temperature,
-                        "efficiency": stats.efficiency
-                    }
+                    "data": _stats_dict(self.miner.get_stats())
                 })
             except Exception as e:
-                return jsonify({"success": False, "error": str(e)}), 500
+                return _json_response({"success": False, "error": str(e)}, 500)
         
         @self.app.route('/api/performance')
         def get_performance():
             """Get performance monitoring data"""
             try:
+                response = self._cached_response('performance')
+                if response is not None:
+                    return response
+                
                 # Mock performance data for standalone mode
                 perf_data = {
                     "hashrate": random.uniform(800, 1200),
@@ -118,50 +250,47 @@ class MiningDashboard:
                     "gpu_stats": []
                 }
                 
-                system_info = {
-                    "platform": "Linux",
-                    "processor": "Mock CPU",
-                    "cpu_count": 8,
-                    "memory_total": 16777216000,
-                    "gpu_count": 0
-                }
-                
                 recommendations = []
                 if perf_data["temperature"] > 70:
                     recommendations.append("Temperature is getting high, consider reducing intensity")
                 if perf_data["cpu_percent"] > 85:
                     recommendations.append("CPU usage is high, close other applications")
                 
-                return jsonify({
+                return self._cache_response('performance', {
                     "success": True,
                     "data": {
                         "performance": perf_data,
-                        "system_info": system_info,
+                        "system_info": _MOCK_SYSTEM_INFO,
                         "recommendations": recommendations
                     }
                 })
             except Exception as e:
-                return jsonify({"success": False, "error": str(e)}), 500
+                return _json_response({"success": False, "error": str(e)}, 500)
         
         @self.app.route('/api/algorithms')
         def get_algorithms():
             """Get algorithm information and profitability"""
             try:
+                response = self._cached_response('algorithms')
+                if response is not None:
+                    return response
+                
                 # Mock algorithm info for standalone mode
+                now = time.time()
                 current_algo = {
                     "name": "SHA-256",
                     "type": "CPU",
                     "performance": {
                         "hashrate": random.uniform(800, 1200),
                         "total_hashes": random.randint(100000, 500000),
-                        "uptime": time.time(),
+                        "uptime": now,
                         "algorithm_type": "CPU"
                     }
                 }
                 
                 profit_summary = {
                     "current_algorithm": "sha256",
-                    "last_update": time.time(),
+                    "last_update": now,
                     "algorithms": {
                         "sha256": {
                             "hashrate": random.uniform(800, 1200),
@@ -185,11 +314,11 @@ class MiningDashboard:
                 }
                 
                 switch_history = [
-                    {"timestamp": time.time() - 3600, "from": "ethash", "to": "sha256"},
-                    {"timestamp": time.time() - 7200, "from": "randomx", "to": "ethash"}
+                    {"timestamp": now - age, "from": from_algo, "to": to_algo}
+                    for age, from_algo, to_algo in _MOCK_SWITCHES
                 ]
                 
-                return jsonify({
+                return self._cache_response('algorithms', {
                     "success": True,
                     "data": {
                         "current_algorithm": current_algo,
@@ -198,19 +327,20 @@ class MiningDashboard:
                     }
                 })
             except Exception as e:
-                return jsonify({"success": False, "error": str(e)}), 500
+                return _json_response({"success": False, "error": str(e)}, 500)
         
         @self.app.route('/api/config')
         def get_config():
             """Get current configuration"""
             try:
                 config_dict = self.miner.config if hasattr(self.miner, 'config') else {}
-                return jsonify({
+                body = _json_dumps({
                     "success": True,
                     "data": config_dict
                 })
+                return _etag_response(body, _etag(body))
             except Exception as e:
-                return jsonify({"success": False, "error": str(e)}), 500
+                return _json_response({"success": False, "error": str(e)}, 500)
         
         @self.app.route('/api/control', methods=['GET', 'POST'])
         def control_miner():
@@ -222,10 +352,10 @@ class MiningDashboard:
                     action = request.args.get('action')
                 
                 if not self.miner:
-                    return jsonify({
+                    return _json_response({
                         "success": False, 
                         "error": "No miner instance available in standalone mode"
-                    }), 503
+                    }, 503)
                 
                 if action == 'start':
                     self.miner.start()
@@ -236,12 +366,14 @@ class MiningDashboard:
                 elif action == 'resume':
                     self.miner.resume()
                 else:
-                    return jsonify({"success": False, "error": "Invalid action"}), 400
+                    return _json_response({"success": False, "error": "Invalid action"}, 400)
                 
-                return jsonify({"success": True, "message": f"Action {action} executed"})
+                # The miner's state just changed; don't serve stats from before it
+                self._response_cache.clear()
+                return _json_response({"success": True, "message": f"Action {action} executed"})
                 
             except Exception as e:
-                return jsonify({"success": False, "error": str(e)}), 500
+                return _json_response({"success": False, "error": str(e)}, 500)
         
         @self.app.route('/api/logs')
         def get_logs():
@@ -254,25 +386,30 @@ class MiningDashboard:
                     {"timestamp": time.time() - 120, "level": "WARNING", "message": "Temperature above optimal"}
                 ]
                 
-                return jsonify({
+                return _json_response({
                     "success": True,
                     "data": logs
                 })
             except Exception as e:
-                return jsonify({"success": False, "error": str(e)}), 500
+                return _json_response({"success": False, "error": str(e)}, 500)
     
     def _setup_socketio_events(self):
         """Setup SocketIO events for real-time updates"""
         
         @self.socketio.on('connect')
         def handle_connect():
-            self.connected_clients += 1
+            with self._clients_lock:
+                self.connected_clients += 1
+                self._clients_active.set()
             logger.info(f"Dashboard client connected. Total: {self.connected_clients}")
             emit('status', {'message': 'Connected to mining dashboard'})
         
         @self.socketio.on('disconnect')
         def handle_disconnect():
-            self.connected_clients -= 1
+            with self._clients_lock:
+                self.connected_clients -= 1
+                if self.connected_clients <= 0:
+                    self._clients_active.clear()
             logger.info(f"Dashboard client disconnected. Total: {self.connected_clients}")
         
         @self.socketio.on('subscribe')
@@ -285,38 +422,57 @@ class MiningDashboard:
     def start_broadcast_thread(self):
         """Start thread for broadcasting real-time updates"""
         def broadcast_loop():
+            next_tick = time.monotonic()
+            backoff = 0.0
+            
             while True:
                 try:
-                    if self.connected_clients > 0:
-                        # Broadcast mining stats
-                        stats = self.miner.get_stats()
-                        self.socketio.emit('stats_update', {
-                            'hashrate': stats.hashrate,
-                            'accepted_shares': stats.accepted_shares,
-                            'rejected_shares': stats.rejected_shares,
-                            'uptime': stats.uptime,
-                            'power_usage': stats.power_usage,
-                            'temperature': stats.temperature,
-                            'efficiency': stats.efficiency
-                        })
-                        
-                        # Broadcast performance data
-                        perf_data = self.miner.performance_monitor.get_current_stats()
-                        self.socketio.emit('performance_update', perf_data)
-                        
-                        # Broadcast algorithm info
-                        algo_info = self.miner.get_algorithm_info()
-                        if algo_info:
-                            self.socketio.emit('algorithm_update', algo_info)
+                    if not self._clients_active.is_set():
+                        # Nobody is watching: block instead of waking every tick
+                        self._clients_active.wait()
+                        next_tick = time.monotonic()
                     
-                    time.sleep(self.update_interval)
+                    # Mining stats, performance data and algorithm info
+                    # go out as one event: one frame per client per tick
+                    update = {'stats': _stats_dict(self.miner.get_stats())}
+                    
+                    # MockMiner (standalone mode) has no performance monitor
+                    # or algorithm info; leave those keys out
+                    performance_monitor = getattr(self.miner, 'performance_monitor', None)
+                    if performance_monitor is not None:
+                        update['performance'] = performance_monitor.get_current_stats()
+                    
+                    get_algorithm_info = getattr(self.miner, 'get_algorithm_info', None)
+                    algo_info = get_algorithm_info() if get_algorithm_info else None
+                    if algo_info:
+                        update['algorithm'] = algo_info
+                    
+                    # A broadcast emit encodes the packet once and sends
+                    # the same frame to every client (python-socketio 5.8+)
+                    self.socketio.emit('update', update)
+                    
+                    backoff = 0.0
+                    
+                    # Sleep until the next tick's deadline, so the time spent
+                    # emitting doesn't stretch the period
+                    next_tick += self.update_interval
+                    delay = next_tick - time.monotonic()
+                    if delay > 0:
+                        self.socketio.sleep(delay)
+                    else:
+                        # Running behind: skip the missed ticks rather than burst
+                        next_tick = time.monotonic()
                     
                 except Exception as e:
                     logger.error(f"Error broadcasting updates: {e}")
-                    time.sleep(5)
-        
-        broadcast_thread = threading.Thread(target=broadcast_loop, daemon=True)
-        broadcast_thread.start()
+                    # Back off exponentially while errors persist, up to ten intervals
+                    backoff = min(max(backoff * 2, self.update_interval), self.update_interval * 10)
+                    self.socketio.sleep(backoff)
+                    next_tick = time.monotonic()
+        
+        # Runs as a green thread under eventlet/gevent and a real thread in
+        # threading mode, so it never blocks the server's I/O loop
+        self.socketio.start_background_task(broadcast_loop)
     
     def run(self, host='0.0.0.0', port=8080, debug=False):
         """Start the dashboard server"""
@@ -344,6 +500,9 @@ DASHBOARD_HTML = """
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Advanced Mining Dashboard</title>
     <script src="https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.0.1/socket.io.js"></script>
+    {% if msgpack %}
+    <script src="https://cdn.jsdelivr.net/npm/socket.io-msgpack-parser@3.0.2/dist/socket.io.msgpack.parser.js"></script>
+    {% endif %}
     <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
     <style>
         * { margin: 0; padding: 0; box-sizing: border-box; }
@@ -554,9 +713,10 @@ DASHBOARD_HTML = """
     
     <script>
         // Socket.IO connection
-        const socket = io();
+        const socket = {% if msgpack %}io({ parser: msgpackParser }){% else %}io(){% endif %};
         
         // Chart setup
+        const CHART_POINTS = 20;
         const ctx = document.getElementById('hashrateChart').getContext('2d');
         const hashrateChart = new Chart(ctx, {
             type: 'line',
@@ -584,59 +744,84 @@ DASHBOARD_HTML = """
             addLog('Connected to mining server', 'info');
         });
         
-        socket.on('stats_update', function(data) {
-            updateStats(data);
+        socket.on('update', function(data) {
+            updateStats(data.stats);
+            if (data.performance) updatePerformance(data.performance);
+            if (data.algorithm) updateAlgorithm(data.algorithm);
         });
         
-        socket.on('performance_update', function(data) {
-            updatePerformance(data);
-        });
+        // Update functions
+        // Last text shown per element: most fields repeat between ticks, and
+        // skipping unchanged writes saves the DOM update and re-layout
+        const shownText = new Map();
+        // Changed text is queued and written in one animation frame, so the
+        // writes of an update event cost at most one layout
+        const elements = new Map();
+        let pendingText = null;
+        function setText(id, text) {
+            if (shownText.get(id) === text) return;
+            shownText.set(id, text);
+            if (pendingText === null) {
+                pendingText = new Map();
+                requestAnimationFrame(flushText);
+            }
+            pendingText.set(id, text);
+        }
         
-        socket.on('algorithm_update', function(data) {
-            updateAlgorithm(data);
-        });
+        function flushText() {
+            const writes = pendingText;
+            pendingText = null;
+            writes.forEach((text, id) => {
+                let element = elements.get(id);
+                if (element === undefined) {
+                    element = document.getElementById(id);
+                    elements.set(id, element);
+                }
+                element.textContent = text;
+            });
+        }
         
-        // Update functions
         function updateStats(data) {
-            document.getElementById('hashrate').textContent = formatHashrate(data.hashrate);
-            document.getElementById('accepted').textContent = data.accepted_shares;
-            document.getElementById('rejected').textContent = data.rejected_shares;
-            document.getElementById('uptime').textContent = formatUptime(data.uptime);
-            document.getElementById('efficiency').textContent = formatHashrate(data.efficiency) + '/W';
+            setText('hashrate', formatHashrate(data.hashrate));
+            setText('accepted', data.accepted_shares);
+            setText('rejected', data.rejected_shares);
+            setText('uptime', formatUptime(data.uptime));
+            setText('efficiency', formatHashrate(data.efficiency) + '/W');
             
             // Update chart
             const now = new Date().toLocaleTimeString();
             hashrateChart.data.labels.push(now);
             hashrateChart.data.datasets[0].data.push(data.hashrate);
             
-            // Keep only last 20 data points
-            if (hashrateChart.data.labels.length > 20) {
+            // Keep only the last CHART_POINTS data points
+            if (hashrateChart.data.labels.length > CHART_POINTS) {
                 hashrateChart.data.labels.shift();
                 hashrateChart.data.datasets[0].data.shift();
             }
             
-            hashrateChart.update();
+            // A new point arrives every tick; animating each one costs more
+            // than drawing it
+            hashrateChart.update('none');
         }
         
         function updatePerformance(data) {
-            document.getElementById('cpu').textContent = data.cpu_percent.toFixed(1) + '%';
-            document.getElementById('memory').textContent = data.memory_percent.toFixed(1) + '%';
-            document.getElementById('temperature').textContent = data.temperature.toFixed(1) + '°C';
-            document.getElementById('power').textContent = data.power_usage.toFixed(1) + 'W';
+            setText('cpu', data.cpu_percent.toFixed(1) + '%');
+            setText('memory', data.memory_percent.toFixed(1) + '%');
+            setText('temperature', data.temperature.toFixed(1) + '°C');
+            setText('power', data.power_usage.toFixed(1) + 'W');
             
             if (data.gpu_stats && data.gpu_stats.length > 0) {
-                document.getElementById('gpu').textContent = data.gpu_stats[0].load.toFixed(1) + '%';
+                setText('gpu', data.gpu_stats[0].load.toFixed(1) + '%');
             }
         }
         
         function updateAlgorithm(data) {
-            document.getElementById('current-algo').textContent = data.name || 'Unknown';
-            document.getElementById('algo-type').textContent = data.type || 'Unknown';
+            setText('current-algo', data.name || 'Unknown');
+            setText('algo-type', data.type || 'Unknown');
             
             if (data.performance) {
                 const perf = data.performance;
-                document.getElementById('algo-performance').textContent = 
-                    formatHashrate(perf.hashrate) + ' (' + perf.algorithm_type + ')';
+                setText('algo-performance', formatHashrate(perf.hashrate) + ' (' + perf.algorithm_type + ')');
             }
         }
         
@@ -729,13 +914,3 @@ DASHBOARD_HTML = """
 </body>
 </html>
 """
-
-
-def create_template_file():
-    """Create the dashboard HTML template file"""
-    import os
-    template_dir = "src/dashboard/templates"
-    os.makedirs(template_dir, exist_ok=True)
-    
-    with open(os.path.join(template_dir, "dashboard.html"), "w") as f:
-        f.write(DASHBOARD_HTML)
@@ -3,38 +3,74 @@ Comprehensive Monitoring and Alerting System
 Production-grade monitoring with intelligent alerting and notifications
 """
 
+import sys
 import time
 import threading
 import json
+import queue
 import smtplib
-from email.mime.text import MimeText
-from email.mime.multipart import MimeMultipart
-from typing import Dict, Any, List, Optional, Callable, Union
-from dataclasses import dataclass, asdict
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, Any, List, Optional, Callable, Union
+from dataclasses import dataclass, replace
 from enum import Enum
 from pathlib import Path
 import requests
 import websocket
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from utils.production_logger import get_production_logger
-from monitoring.resource_monitor import get_resource_monitor
+from monitoring.resource_monitor import ResourceMetrics, get_resource_monitor
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-class AlertSeverity(Enum):
+
+def _json_dumps(payload: Any, indent: bool = False) -> bytes:
+    """Serialize a notification payload, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(payload, option=option)
+    return json.dumps(payload, indent=2 if indent else None).encode()
+
+
+# str mixins: members compare equal to their value strings. Payloads and
+# dict keys still use .value, so consumers and orjson get plain str
+class AlertSeverity(str, Enum):
     INFO = "info"
     WARNING = "warning"
     ERROR = "error"
     CRITICAL = "critical"
 
 
-class AlertStatus(Enum):
+# Upper-cased severity names for notification subjects and fields
+_SEVERITY_LABEL = {severity: severity.value.upper() for severity in AlertSeverity}
+
+
+def _format_time(timestamp: float) -> str:
+    """Local time of an alert for notifications, without a datetime object"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+
+
+class AlertStatus(str, Enum):
     ACTIVE = "active"
     RESOLVED = "resolved"
     SUPPRESSED = "suppressed"
 
 
-@dataclass
+# dataclass(slots=True) needs Python 3.10; older interpreters keep __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class Alert:
     id: str
     title: str
@@ -46,29 +82,53 @@ class Alert:
     resolved_timestamp: Optional[float] = None
     metadata: Optional[Dict[str, Any]] = None
     suppression_duration: Optional[float] = None
+    rule_name: Optional[str] = None  # None for manual alerts
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the alert, ready for JSON"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "message": self.message,
+            "severity": self.severity.value,
+            "status": self.status.value,
+            "component": self.component,
+            "timestamp": self.timestamp,
+            "resolved_timestamp": self.resolved_timestamp,
+            "metadata": self.metadata,
+            "suppression_duration": self.suppression_duration,
+            "rule_name": self.rule_name
+        }
 
 
 class AlertRule:
     """Base class for alert rules"""
     
+    # Key in metrics["current_metrics"] the rule reads; the monitoring loop
+    # skips such rules outright while the resource monitor has no current metrics
+    required_key: Optional[str] = None
+    
     def __init__(self, name: str, severity: AlertSeverity, cooldown: float = 300.0):
         self.name = name
         self.severity = severity
         self.cooldown = cooldown
-        self.last_triggered = 0.0
+        # Cooldown and suppression run on the monotonic clock, so wall clock
+        # steps neither release nor extend them
+        self.last_triggered = float("-inf")
         self.trigger_count = 0
         self.suppressed_until = 0.0
     
-    def should_trigger(self, metrics: Dict[str, Any]) -> bool:
-        """Check if alert should be triggered"""
-        current_time = time.time()
+    def should_trigger(self, metrics: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """Check if alert should be triggered; now is a time.monotonic() reading"""
+        if now is None:
+            now = time.monotonic()
         
         # Check cooldown
-        if current_time - self.last_triggered < self.cooldown:
+        if now - self.last_triggered < self.cooldown:
             return False
         
         # Check suppression
-        if current_time < self.suppressed_until:
+        if now < self.suppressed_until:
             return False
         
         return self._evaluate_condition(metrics)
@@ -77,20 +137,22 @@ class AlertRule:
         """Override this method to implement alert condition"""
         raise NotImplementedError
     
-    def trigger(self) -> Alert:
-        """Trigger alert"""
-        self.last_triggered = time.time()
+    def trigger(self, now: Optional[float] = None) -> Alert:
+        """Trigger alert; now is a time.monotonic() reading"""
+        self.last_triggered = time.monotonic() if now is None else now
         self.trigger_count += 1
+        timestamp = time.time()
         
         return Alert(
-            id=f"{self.name}_{int(self.last_triggered)}",
+            id=f"{self.name}_{int(timestamp)}",
             title=self.name,
             message=self._get_message(),
             severity=self.severity,
             status=AlertStatus.ACTIVE,
             component=self._get_component(),
-            timestamp=self.last_triggered,
-            metadata=self._get_metadata()
+            timestamp=timestamp,
+            metadata=self._get_metadata(),
+            rule_name=self.name
         )
     
     def _get_message(self) -> str:
@@ -110,15 +172,23 @@ class AlertRule:
     
     def suppress(self, duration: float):
         """Suppress alerts for specified duration"""
-        self.suppressed_until = time.time() + duration
+        self.suppressed_until = time.monotonic() + duration
 
 
-class CPUAlertRule(AlertRule):
-    """CPU usage alert rule"""
+class ThresholdAlertRule(AlertRule):
+    """Fires while a resource metric is above a threshold"""
     
-    def __init__(self, threshold: float = 90.0, duration: float = 300.0):
-        super().__init__("High CPU Usage", AlertSeverity.WARNING, cooldown=300.0)
+    def __init__(self, name: str, required_key: str, threshold: float, component: str,
+                 label: str, severity: AlertSeverity = AlertSeverity.WARNING,
+                 cooldown: float = 300.0, duration: Optional[float] = None, unit: str = "%"):
+        super().__init__(name, severity, cooldown=cooldown)
+        self.required_key = required_key
         self.threshold = threshold
+        self.component = component
+        self.label = label
+        self.unit = unit
+        # Seconds the metric must stay above threshold before the rule fires,
+        # checked against the resource monitor's sample window when it has one
         self.duration = duration
     
     def _evaluate_condition(self, metrics: Dict[str, Any]) -> bool:
@@ -126,108 +196,66 @@ class CPUAlertRule(AlertRule):
         if not current_metrics:
             return False
         
-        return current_metrics.get("cpu_percent", 0) > self.threshold
+        recent = metrics.get("recent_metrics")
+        if self.duration and recent is not None:
+            return self._above_for_duration(recent)
+        
+        return current_metrics.get(self.required_key, 0) > self.threshold
+    
+    def _above_for_duration(self, recent: Dict[str, Any]) -> bool:
+        """Whether every sample of the last duration seconds is above threshold"""
+        timestamps = recent["monotonic"]
+        if timestamps[-1] - timestamps[0] < self.duration:
+            return False  # the window does not cover the duration yet
+        
+        start = timestamps.searchsorted(timestamps[-1] - self.duration)
+        return bool((recent[self.required_key][start:] > self.threshold).all())
     
     def _get_message(self) -> str:
-        return f"CPU usage is above {self.threshold}%"
+        return f"{self.label} is above {self.threshold}{self.unit}"
     
     def _get_component(self) -> str:
-        return "cpu"
+        return self.component
     
     def _get_metadata(self) -> Dict[str, Any]:
         metadata = super()._get_metadata()
-        metadata.update({
-            "threshold": self.threshold,
-            "duration": self.duration
-        })
+        metadata["threshold"] = self.threshold
+        if self.duration is not None:
+            metadata["duration"] = self.duration
         return metadata
 
 
-class MemoryAlertRule(AlertRule):
+class CPUAlertRule(ThresholdAlertRule):
+    """CPU usage alert rule"""
+    
+    def __init__(self, threshold: float = 90.0, duration: float = 300.0):
+        super().__init__("High CPU Usage", "cpu_percent", threshold, "cpu", "CPU usage",
+                         duration=duration)
+
+
+class MemoryAlertRule(ThresholdAlertRule):
     """Memory usage alert rule"""
     
     def __init__(self, threshold: float = 85.0, duration: float = 300.0):
-        super().__init__("High Memory Usage", AlertSeverity.WARNING, cooldown=300.0)
-        self.threshold = threshold
-        self.duration = duration
-    
-    def _evaluate_condition(self, metrics: Dict[str, Any]) -> bool:
-        current_metrics = metrics.get("current_metrics")
-        if not current_metrics:
-            return False
-        
-        return current_metrics.get("memory_percent", 0) > self.threshold
-    
-    def _get_message(self) -> str:
-        return f"Memory usage is above {self.threshold}%"
-    
-    def _get_component(self) -> str:
-        return "memory"
-    
-    def _get_metadata(self) -> Dict[str, Any]:
-        metadata = super()._get_metadata()
-        metadata.update({
-            "threshold": self.threshold,
-            "duration": self.duration
-        })
-        return metadata
+        super().__init__("High Memory Usage", "memory_percent", threshold, "memory", "Memory usage",
+                         duration=duration)
 
 
-class DiskAlertRule(AlertRule):
+class DiskAlertRule(ThresholdAlertRule):
     """Disk space alert rule"""
     
     def __init__(self, threshold: float = 90.0):
-        super().__init__("Low Disk Space", AlertSeverity.ERROR, cooldown=600.0)
-        self.threshold = threshold
-    
-    def _evaluate_condition(self, metrics: Dict[str, Any]) -> bool:
-        current_metrics = metrics.get("current_metrics")
-        if not current_metrics:
-            return False
-        
-        return current_metrics.get("disk_percent", 0) > self.threshold
-    
-    def _get_message(self) -> str:
-        return f"Disk usage is above {self.threshold}%"
-    
-    def _get_component(self) -> str:
-        return "disk"
-    
-    def _get_metadata(self) -> Dict[str, Any]:
-        metadata = super()._get_metadata()
-        metadata.update({
-            "threshold": self.threshold
-        })
-        return metadata
+        super().__init__("Low Disk Space", "disk_percent", threshold, "disk", "Disk usage",
+                         severity=AlertSeverity.ERROR, cooldown=600.0)
 
 
-class TemperatureAlertRule(AlertRule):
+class TemperatureAlertRule(ThresholdAlertRule):
     """Temperature alert rule"""
     
     def __init__(self, threshold: float = 75.0):
-        super().__init__("High Temperature", AlertSeverity.WARNING, cooldown=300.0)
-        self.threshold = threshold
-    
-    def _evaluate_condition(self, metrics: Dict[str, Any]) -> bool:
-        current_metrics = metrics.get("current_metrics")
-        if not current_metrics:
-            return False
-        
-        temp = current_metrics.get("temperature", 0)
-        return temp > 0 and temp > self.threshold
-    
-    def _get_message(self) -> str:
-        return f"System temperature is above {self.threshold}°C"
-    
-    def _get_component(self) -> str:
-        return "temperature"
-    
-    def _get_metadata(self) -> Dict[str, Any]:
-        metadata = super()._get_metadata()
-        metadata.update({
-            "threshold": self.threshold
-        })
-        return metadata
+        # Sensorless hosts report 0, which no positive threshold reaches
+        super().__init__("High Temperature", "temperature", threshold, "temperature",
+                         "System temperature", unit="°C")
 
 
 class MiningAlertRule(AlertRule):
@@ -249,6 +277,18 @@ class MiningAlertRule(AlertRule):
         return "mining"
 
 
+def _create_http_session() -> requests.Session:
+    """Keep-alive session for webhook channels, retrying transient gateway errors"""
+    session = requests.Session()
+    # POST is not retried by default; alert deliveries are safe to repeat
+    retry = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                  allowed_methods=frozenset({"POST"}))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 class AlertChannel:
     """Base class for alert notification channels"""
     
@@ -273,6 +313,10 @@ class AlertChannel:
     def _send_alert(self, alert: Alert) -> bool:
         """Override this method to implement alert sending"""
         raise NotImplementedError
+    
+    def close(self):
+        """Release resources held by the channel"""
+        pass
 
 
 class EmailAlertChannel(AlertChannel):
@@ -287,6 +331,42 @@ class EmailAlertChannel(AlertChannel):
         self.from_email = config.get("from_email", "")
         self.to_emails = config.get("to_emails", [])
         self.use_tls = config.get("use_tls", True)
+        
+        # One authenticated connection serves every alert until the server drops it
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
+    
+    def _get_client(self) -> smtplib.SMTP:
+        """Return the open SMTP connection, reconnecting if the server dropped it"""
+        if self._smtp is not None:
+            try:
+                self._smtp.noop()
+                return self._smtp
+            except (smtplib.SMTPException, OSError):
+                self._close_client()
+        
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.username and self.password:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        
+        self._smtp = server
+        return server
+    
+    def _close_client(self):
+        """Drop the SMTP connection, ignoring errors from a dead socket"""
+        server, self._smtp = self._smtp, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
     
     def _send_alert(self, alert: Alert) -> bool:
         """Send alert via email"""
@@ -294,41 +374,40 @@ class EmailAlertChannel(AlertChannel):
             return False
         
         # Create message
-        msg = MimeMultipart()
+        msg = MIMEMultipart()
         msg['From'] = self.from_email
         msg['To'] = ', '.join(self.to_emails)
-        msg['Subject'] = f"[{alert.severity.value.upper()}] {alert.title}"
+        msg['Subject'] = f"[{_SEVERITY_LABEL[alert.severity]}] {alert.title}"
         
         # Email body
         body = f"""
 Alert: {alert.title}
 Severity: {alert.severity.value}
 Component: {alert.component}
-Time: {datetime.fromtimestamp(alert.timestamp).strftime('%Y-%m-%d %H:%M:%S')}
+Time: {_format_time(alert.timestamp)}
 
 Message:
 {alert.message}
 
 Metadata:
-{json.dumps(alert.metadata or {}, indent=2)}
+{_json_dumps(alert.metadata or {}, indent=True).decode()}
 """
         
-        msg.attach(MimeText(body, 'plain'))
+        msg.attach(MIMEText(body, 'plain'))
         
-        # Send email
-        try:
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            if self.use_tls:
-                server.starttls()
-            if self.username and self.password:
-                server.login(self.username, self.password)
-            
-            server.send_message(msg)
-            server.quit()
-            return True
-            
-        except Exception as e:
-            raise e
+        # Send email, keeping the connection open for the next alert
+        with self._smtp_lock:
+            try:
+                self._get_client().send_message(msg)
+            except Exception:
+                self._close_client()
+                raise
+        return True
+    
+    def close(self):
+        """Close the SMTP connection"""
+        with self._smtp_lock:
+            self._close_client()
 
 
 class WebhookAlertChannel(AlertChannel):
@@ -339,6 +418,13 @@ class WebhookAlertChannel(AlertChannel):
         self.webhook_url = config.get("webhook_url", "")
         self.headers = config.get("headers", {})
         self.timeout = config.get("timeout", 10)
+        self.session = _create_http_session()
+        
+        # Built once; custom headers may override the content type
+        self._request_headers = {
+            "Content-Type": "application/json",
+            **self.headers
+        }
     
     def _send_alert(self, alert: Alert) -> bool:
         """Send alert via webhook"""
@@ -356,55 +442,58 @@ class WebhookAlertChannel(AlertChannel):
             "metadata": alert.metadata or {}
         }
         
-        headers = {
-            "Content-Type": "application/json",
-            **self.headers
-        }
-        
-        response = requests.post(
+        response = self.session.post(
             self.webhook_url,
-            json=payload,
-            headers=headers,
+            data=_json_dumps(payload),
+            headers=self._request_headers,
             timeout=self.timeout
         )
         
         return response.status_code == 200
+    
+    def close(self):
+        """Close the HTTP session"""
+        self.session.close()
 
 
 class SlackAlertChannel(AlertChannel):
     """Slack alert notification channel"""
     
+    # Attachment color for each severity
+    COLOR_MAP = {
+        AlertSeverity.INFO: "good",
+        AlertSeverity.WARNING: "warning",
+        AlertSeverity.ERROR: "danger",
+        AlertSeverity.CRITICAL: "#ff0000"
+    }
+    JSON_HEADERS = {"Content-Type": "application/json"}
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__("slack", config)
         self.webhook_url = config.get("webhook_url", "")
         self.channel = config.get("channel", "#alerts")
         self.username = config.get("username", "Miner Alert")
+        self.session = _create_http_session()
+        
+        # Payload fields that are the same for every alert
+        self._static_payload = {"channel": self.channel, "username": self.username}
     
     def _send_alert(self, alert: Alert) -> bool:
         """Send alert to Slack"""
         if not self.webhook_url:
             return False
         
-        # Color based on severity
-        color_map = {
-            AlertSeverity.INFO: "good",
-            AlertSeverity.WARNING: "warning",
-            AlertSeverity.ERROR: "danger",
-            AlertSeverity.CRITICAL: "#ff0000"
-        }
-        
         payload = {
-            "channel": self.channel,
-            "username": self.username,
+            **self._static_payload,
             "attachments": [
                 {
-                    "color": color_map.get(alert.severity, "warning"),
+                    "color": self.COLOR_MAP.get(alert.severity, "warning"),
                     "title": alert.title,
                     "text": alert.message,
                     "fields": [
                         {
                             "title": "Severity",
-                            "value": alert.severity.value.upper(),
+                            "value": _SEVERITY_LABEL[alert.severity],
                             "short": True
                         },
                         {
@@ -414,7 +503,7 @@ class SlackAlertChannel(AlertChannel):
                         },
                         {
                             "title": "Time",
-                            "value": datetime.fromtimestamp(alert.timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+                            "value": _format_time(alert.timestamp),
                             "short": True
                         }
                     ],
@@ -424,8 +513,13 @@ class SlackAlertChannel(AlertChannel):
             ]
         }
         
-        response = requests.post(self.webhook_url, json=payload, timeout=10)
+        response = self.session.post(self.webhook_url, data=_json_dumps(payload),
+                                     headers=self.JSON_HEADERS, timeout=10)
         return response.status_code == 200
+    
+    def close(self):
+        """Close the HTTP session"""
+        self.session.close()
 
 
 class AlertingSystem:
@@ -436,29 +530,56 @@ class AlertingSystem:
         self.logger = get_production_logger()
         self.resource_monitor = get_resource_monitor()
         
-        # Alert rules
+        # Alert rules, indexed by name. Several rules may share a name (the
+        # warning and critical levels); the index keeps the first, as the
+        # old linear lookups did
         self.alert_rules: List[AlertRule] = []
+        self._rules_by_name: Dict[str, AlertRule] = {}
         self._setup_default_rules()
         
         # Alert channels
         self.alert_channels: List[AlertChannel] = []
         self._setup_channels()
         
-        # Alert storage
+        # Alert storage. A runaway rule raises a new alert id every second;
+        # past max_active_alerts new alerts are dropped rather than stored
         self.active_alerts: Dict[str, Alert] = {}
-        self.alert_history: List[Alert] = []
+        self.max_active_alerts = config.get("max_active_alerts", 1000)
+        self.dropped_alerts = 0
+        self._drop_warned_at = float("-inf")
         self.max_history = 1000
+        self.alert_history: Deque[Alert] = deque(maxlen=self.max_history)
         
         # Monitoring thread
         self.monitoring_thread = None
         self.running = False
         self.check_interval = 30.0  # Check every 30 seconds
         
+        # Notifications are delivered by worker threads, started on the first
+        # alert, so slow SMTP/HTTP never stalls the monitoring loop
+        self.notif_workers = config.get("notif_workers", 4)
+        self._notif_queue: queue.Queue = queue.Queue(maxsize=10000)
+        self._notif_threads: List[threading.Thread] = []
+        self._notif_lock = threading.Lock()
+        self.dropped_notifications = 0
+        
         # Statistics
         self.total_alerts = 0
-        self.alerts_by_severity = {severity: 0 for severity in AlertSeverity}
+        self.alerts_by_severity = {severity.value: 0 for severity in AlertSeverity}
         self.alerts_by_component = {}
         
+        # Guards active_alerts, alert_history and the counters above; the
+        # monitoring loop, manual alerts and readers run on different threads
+        self._state_lock = threading.RLock()
+        
+        # The resource monitor pushes each sample; a sample that moves a
+        # threshold rule across its threshold wakes the monitoring loop early,
+        # so short spikes are not missed between check_interval heartbeats
+        self._wake = threading.Event()
+        self._crossed: tuple = ()
+        if self.resource_monitor:
+            self.resource_monitor.add_metrics_callback(self._on_metrics)
+        
         if self.logger:
             self.logger.log_info("Alerting system initialized", component="alerting")
     
@@ -494,6 +615,8 @@ class AlertingSystem:
             temp_warning, temp_critical,
             mining_alert
         ]
+        for rule in self.alert_rules:
+            self._rules_by_name.setdefault(rule.name, rule)
     
     def _setup_channels(self):
         """Setup alert notification channels"""
@@ -517,6 +640,7 @@ class AlertingSystem:
     def add_alert_rule(self, rule: AlertRule):
         """Add custom alert rule"""
         self.alert_rules.append(rule)
+        self._rules_by_name.setdefault(rule.name, rule)
         
         if self.logger:
             self.logger.log_info(f"Added alert rule: {rule.name}", component="alerting")
@@ -543,56 +667,100 @@ class AlertingSystem:
     def stop_monitoring(self):
         """Stop alert monitoring"""
         self.running = False
+        self._wake.set()
         if self.monitoring_thread:
             self.monitoring_thread.join(timeout=5)
         
         if self.logger:
             self.logger.log_info("Alert monitoring stopped", component="alerting")
     
+    def close(self):
+        """Release channel resources; call after stop_monitoring()"""
+        for channel in self.alert_channels:
+            channel.close()
+    
     def _monitoring_loop(self):
         """Main monitoring loop"""
+        next_tick = time.monotonic()
+        
         while self.running:
             try:
+                # Sleep until the next heartbeat unless a pushed sample wakes us
+                self._wake.wait(max(0.0, next_tick - time.monotonic()))
+                self._wake.clear()
+                if not self.running:
+                    break
+                
                 # Get current metrics
                 metrics = {}
                 if self.resource_monitor:
                     resource_stats = self.resource_monitor.get_stats()
                     metrics.update(resource_stats)
+                    metrics["recent_metrics"] = self.resource_monitor.get_recent_metrics()
+                
+                # One clock reading serves every rule on this pass
+                now = time.monotonic()
                 
                 # Check all alert rules
-                for rule in self.alert_rules:
-                    try:
-                        if rule.should_trigger(metrics):
-                            alert = rule.trigger()
-                            self._handle_alert(alert)
-                    except Exception as e:
-                        if self.logger:
-                            self.logger.log_error(f"Alert rule {rule.name} failed: {e}", component="alerting")
+                self._evaluate_rules(metrics, now)
                 
                 # Check for resolved alerts
-                self._check_resolved_alerts(metrics)
+                self._check_resolved_alerts(metrics, now)
                 
-                time.sleep(self.check_interval)
+                # Heartbeats start check_interval apart however long the checks
+                # take; passes woken in between leave the schedule alone
+                if now >= next_tick:
+                    next_tick = max(next_tick + self.check_interval, time.monotonic())
                 
             except Exception as e:
                 if self.logger:
                     self.logger.log_error(f"Alert monitoring loop error: {e}", component="alerting")
                 time.sleep(60)  # Wait longer on error
+                next_tick = time.monotonic()
+    
+    def _on_metrics(self, metrics: ResourceMetrics):
+        """Resource monitor callback: wake the loop when a threshold rule's state flips"""
+        crossed = tuple(getattr(metrics, rule.required_key, 0) > rule.threshold
+                        for rule in self.alert_rules if isinstance(rule, ThresholdAlertRule))
+        if crossed != self._crossed:
+            self._crossed = crossed
+            self._wake.set()
+    
+    def _evaluate_rules(self, metrics: Dict[str, Any], now: Optional[float] = None):
+        """Evaluate the alert rules and raise alerts for those that trigger"""
+        if now is None:
+            now = time.monotonic()
+        
+        # Threshold rules all read current_metrics: without it none can fire
+        has_current = bool(metrics.get("current_metrics"))
+        rules = [rule for rule in self.alert_rules if has_current or rule.required_key is None]
+        
+        for rule in rules:
+            try:
+                if rule.should_trigger(metrics, now):
+                    self._handle_alert(rule.trigger(now))
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_error(f"Alert rule {rule.name} failed: {e}", component="alerting")
     
     def _handle_alert(self, alert: Alert):
         """Handle new alert"""
-        # Add to active alerts
-        self.active_alerts[alert.id] = alert
-        
-        # Add to history
-        self.alert_history.append(alert)
-        if len(self.alert_history) > self.max_history:
-            self.alert_history.pop(0)
-        
-        # Update statistics
-        self.total_alerts += 1
-        self.alerts_by_severity[alert.severity] += 1
-        self.alerts_by_component[alert.component] = self.alerts_by_component.get(alert.component, 0) + 1
+        severity, component = alert.severity, alert.component
+        with self._state_lock:
+            if len(self.active_alerts) >= self.max_active_alerts and alert.id not in self.active_alerts:
+                self._drop_alert()
+                return
+            
+            # Add to active alerts
+            self.active_alerts[alert.id] = alert
+            
+            # Add to history
+            self.alert_history.append(alert)  # the deque drops the oldest itself
+            
+            # Update statistics
+            self.total_alerts += 1
+            self.alerts_by_severity[severity.value] += 1
+            self.alerts_by_component[component] = self.alerts_by_component.get(component, 0) + 1
         
         # Log alert
         if self.logger:
@@ -601,54 +769,110 @@ class AlertingSystem:
                 component="alerting",
                 alert_id=alert.id,
                 severity=alert.severity.value,
-                component=alert.component
+                alert_component=alert.component
             )
         
         # Send notifications
         self._send_notifications(alert)
     
-    def _check_resolved_alerts(self, metrics: Dict[str, Any]):
+    def _drop_alert(self):
+        """Count an alert dropped at the active-alert cap, warning at most once a minute"""
+        self.dropped_alerts += 1
+        now = time.monotonic()
+        if now - self._drop_warned_at < 60:
+            return
+        self._drop_warned_at = now
+        
+        if self.logger:
+            self.logger.log_warning(
+                f"Active alert limit ({self.max_active_alerts}) reached, "
+                f"{self.dropped_alerts} alerts dropped",
+                component="alerting"
+            )
+    
+    def _check_resolved_alerts(self, metrics: Dict[str, Any], now: Optional[float] = None):
         """Check if any alerts should be resolved"""
+        if now is None:
+            now = time.monotonic()
+        resolved_at = time.time()
         resolved_alerts = []
         
-        for alert_id, alert in self.active_alerts.items():
-            # Find the rule that triggered this alert
-            rule = None
-            for r in self.alert_rules:
-                if r.name == alert.title:
-                    rule = r
-                    break
-            
-            if rule and not rule.should_trigger(metrics):
-                # Alert is resolved
-                alert.status = AlertStatus.RESOLVED
-                alert.resolved_timestamp = time.time()
-                resolved_alerts.append(alert_id)
+        with self._state_lock:
+            for alert_id, alert in self.active_alerts.items():
+                # Find the rule that triggered this alert
+                rule = self._rules_by_name.get(alert.rule_name) if alert.rule_name else None
                 
-                # Log resolution
-                if self.logger:
-                    self.logger.log_info(
-                        f"Alert resolved: {alert.title}",
-                        component="alerting",
-                        alert_id=alert.id,
-                        duration=alert.resolved_timestamp - alert.timestamp
-                    )
-                
-                # Send resolution notification
-                self._send_notifications(alert)
+                if rule and not rule.should_trigger(metrics, now):
+                    # Alert is resolved
+                    alert.status = AlertStatus.RESOLVED
+                    alert.resolved_timestamp = resolved_at
+                    resolved_alerts.append(alert)
+            
+            # Remove resolved alerts from active list
+            for alert in resolved_alerts:
+                del self.active_alerts[alert.id]
         
-        # Remove resolved alerts from active list
-        for alert_id in resolved_alerts:
-            del self.active_alerts[alert_id]
+        # Log and notify outside the lock
+        for alert in resolved_alerts:
+            if self.logger:
+                self.logger.log_info(
+                    f"Alert resolved: {alert.title}",
+                    component="alerting",
+                    alert_id=alert.id,
+                    duration=alert.resolved_timestamp - alert.timestamp
+                )
+            
+            # Send resolution notification
+            self._send_notifications(alert)
     
     def _send_notifications(self, alert: Alert):
-        """Send alert notifications through all channels"""
+        """Queue alert notifications for every channel"""
+        if not self.alert_channels:
+            return
+        self._start_notification_workers()
+        
+        # Send a copy: the alert may be resolved before a worker gets to it
+        snapshot = replace(alert)
         for channel in self.alert_channels:
+            try:
+                self._notif_queue.put_nowait((snapshot, channel))
+            except queue.Full:
+                # Drop the oldest notification to make room for the newest
+                try:
+                    self._notif_queue.get_nowait()
+                    self._notif_queue.task_done()
+                except queue.Empty:
+                    pass
+                self.dropped_notifications += 1
+                try:
+                    self._notif_queue.put_nowait((snapshot, channel))
+                except queue.Full:
+                    self.dropped_notifications += 1
+    
+    def _start_notification_workers(self):
+        """Start the notification worker threads if they are not running"""
+        if self._notif_threads:
+            return
+        with self._notif_lock:
+            if self._notif_threads:
+                return
+            for i in range(max(1, self.notif_workers)):
+                thread = threading.Thread(target=self._notification_worker,
+                                          name=f"alert-notify-{i}", daemon=True)
+                thread.start()
+                self._notif_threads.append(thread)
+    
+    def _notification_worker(self):
+        """Deliver queued notifications, one channel call at a time"""
+        while True:
+            alert, channel = self._notif_queue.get()
             try:
                 channel.send_alert(alert)
             except Exception as e:
                 if self.logger:
                     self.logger.log_error(f"Failed to send notification via {channel.name}: {e}", component="alerting")
+            finally:
+                self._notif_queue.task_done()
     
     def create_manual_alert(self, title: str, message: str, severity: AlertSeverity, component: str = "manual", metadata: Optional[Dict[str, Any]] = None) -> str:
         """Create a manual alert"""
@@ -668,47 +892,64 @@ class AlertingSystem:
     
     def acknowledge_alert(self, alert_id: str) -> bool:
         """Acknowledge an alert"""
-        if alert_id in self.active_alerts:
-            alert = self.active_alerts[alert_id]
-            alert.status = AlertStatus.SUPPRESSED
-            alert.suppression_duration = 3600  # Suppress for 1 hour
-            
-            if self.logger:
-                self.logger.log_info(f"Alert acknowledged: {alert_id}", component="alerting")
-            
-            return True
-        return False
+        with self._state_lock:
+            alert = self.active_alerts.get(alert_id)
+            if alert is not None:
+                alert.status = AlertStatus.SUPPRESSED
+                alert.suppression_duration = 3600  # Suppress for 1 hour
+        
+        if alert is None:
+            return False
+        
+        if self.logger:
+            self.logger.log_info(f"Alert acknowledged: {alert_id}", component="alerting")
+        
+        return True
     
     def suppress_alert_rule(self, rule_name: str, duration: float) -> bool:
         """Suppress alert rule for specified duration"""
-        for rule in self.alert_rules:
-            if rule.name == rule_name:
-                rule.suppress(duration)
-                
-                if self.logger:
-                    self.logger.log_info(f"Alert rule suppressed: {rule_name} for {duration}s", component="alerting")
-                
-                return True
-        return False
+        with self._state_lock:
+            rule = self._rules_by_name.get(rule_name)
+            if rule is None:
+                return False
+            rule.suppress(duration)
+        
+        if self.logger:
+            self.logger.log_info(f"Alert rule suppressed: {rule_name} for {duration}s", component="alerting")
+        
+        return True
     
     def get_active_alerts(self) -> List[Dict[str, Any]]:
         """Get all active alerts"""
-        return [asdict(alert) for alert in self.active_alerts.values()]
+        with self._state_lock:
+            alerts = list(self.active_alerts.values())
+        return [alert.to_dict() for alert in alerts]
     
     def get_alert_history(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get alert history"""
-        recent_alerts = self.alert_history[-limit:] if len(self.alert_history) > limit else self.alert_history
-        return [asdict(alert) for alert in recent_alerts]
+        with self._state_lock:
+            history = self.alert_history
+            recent_alerts = list(islice(history, max(0, len(history) - limit), None))
+        return [alert.to_dict() for alert in recent_alerts]
     
     def get_stats(self) -> Dict[str, Any]:
         """Get alerting statistics"""
+        with self._state_lock:
+            total_alerts = self.total_alerts
+            active_alerts = len(self.active_alerts)
+            alerts_by_severity = dict(self.alerts_by_severity)
+            alerts_by_component = dict(self.alerts_by_component)
+        
         return {
-            "total_alerts": self.total_alerts,
-            "active_alerts": len(self.active_alerts),
-            "alerts_by_severity": {severity.value: count for severity, count in self.alerts_by_severity.items()},
-            "alerts_by_component": self.alerts_by_component,
+            "total_alerts": total_alerts,
+            "active_alerts": active_alerts,
+            "alerts_by_severity": alerts_by_severity,
+            "alerts_by_component": alerts_by_component,
             "alert_rules": len(self.alert_rules),
             "alert_channels": len(self.alert_channels),
+            "pending_notifications": self._notif_queue.qsize(),
+            "dropped_notifications": self.dropped_notifications,
+            "dropped_alerts": self.dropped_alerts,
             "monitoring_active": self.running,
             "check_interval": self.check_interval
         }
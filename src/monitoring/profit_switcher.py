@@ -6,7 +6,7 @@ Automatically switches between algorithms based on profitability
 import threading
 import time
 import random
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 
@@ -59,6 +59,9 @@ class ProfitSwitcher:
         self._lock = threading.Lock()
         self._update_thread = None
         
+        # Called after each profitability refresh
+        self._update_callbacks: List[Callable[[], None]] = []
+        
         # Market data simulation (in real implementation, would use APIs)
         self.market_prices = {
             "BTC": 45000.0,
@@ -87,6 +90,10 @@ class ProfitSwitcher:
         
         logger.info("Profit switcher stopped")
     
+    def add_update_callback(self, callback: Callable[[], None]):
+        """Call callback whenever profitability data has been refreshed"""
+        self._update_callbacks.append(callback)
+    
     def get_best_algorithm(self) -> str:
         """Get the currently most profitable algorithm"""
         with self._lock:
@@ -221,6 +228,12 @@ class ProfitSwitcher:
                 
             except Exception as e:
                 logger.error(f"Error calculating profitability for {algorithm_name}: {e}")
+        
+        for callback in self._update_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Profit update callback error: {e}")
     
     def _calculate_profitability(self, algorithm_name: str) -> ProfitabilityData:
         """Calculate profitability for a specific algorithm"""
@@ -16,6 +16,18 @@ from pathlib import Path
 
 from utils.production_logger import get_production_logger
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Metrics kept in the sample window for rules that need a duration above
+# threshold; samples are stamped with time.monotonic(), so clock steps can't
+# reorder the window
+_WINDOW_KEYS = ("monotonic", "cpu_percent", "memory_percent", "disk_percent", "temperature")
+
 
 class ResourceStatus(Enum):
     NORMAL = "normal"
@@ -222,9 +234,20 @@ class ResourceMonitor:
         self.metrics_history: List[ResourceMetrics] = []
         self.max_history = 3600  # 1 hour at 1-second intervals
         
+        # Ring buffer of the same samples, one row per _WINDOW_KEYS entry.
+        # Written on the monitoring thread and read by the alerting thread
+        self._window_lock = threading.Lock()
+        if NUMPY_AVAILABLE:
+            self._window = np.zeros((len(_WINDOW_KEYS), self.max_history))
+        self._window_pos = 0
+        self._window_count = 0
+        
         # Scaling policies
         self.scaling_policies: List[ScalingPolicy] = []
         
+        # Called with every new sample, on the monitoring thread
+        self._metrics_callbacks: List[Callable[[ResourceMetrics], None]] = []
+        
         # Monitoring thread
         self.monitoring_thread = None
         self.running = False
@@ -252,6 +275,10 @@ class ResourceMonitor:
         if self.logger:
             self.logger.log_info(f"Added scaling policy: {policy.name}", component="monitoring")
     
+    def add_metrics_callback(self, callback: Callable[[ResourceMetrics], None]):
+        """Call callback with every new sample; keep it short, it runs on the monitoring thread"""
+        self._metrics_callbacks.append(callback)
+    
     def start_monitoring(self, miner_instance=None):
         """Start resource monitoring"""
         if self.running:
@@ -377,6 +404,13 @@ class ResourceMonitor:
         if len(self.metrics_history) > self.max_history:
             self.metrics_history.pop(0)
         
+        if NUMPY_AVAILABLE:
+            column = [time.monotonic()] + [getattr(metrics, key) for key in _WINDOW_KEYS[1:]]
+            with self._window_lock:
+                self._window[:, self._window_pos] = column
+                self._window_pos = (self._window_pos + 1) % self.max_history
+                self._window_count = min(self._window_count + 1, self.max_history)
+        
         # Log performance metrics
         if self.logger:
             self.logger.log_performance("cpu_usage", metrics.cpu_percent, "percent")
@@ -391,6 +425,13 @@ class ResourceMonitor:
         # Execute scaling policies
         if self.enable_auto_scaling:
             self._execute_scaling_policies(metrics)
+        
+        for callback in self._metrics_callbacks:
+            try:
+                callback(metrics)
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_error(f"Metrics callback error: {e}", component="monitoring")
     
     def _check_alerts(self, metrics: ResourceMetrics):
         """Check for alert conditions"""
@@ -439,6 +480,19 @@ class ResourceMonitor:
         """Get the most recent metrics"""
         return self.metrics_history[-1] if self.metrics_history else None
     
+    def get_recent_metrics(self) -> Optional[Dict[str, Any]]:
+        """Recent samples of each windowed metric as NumPy arrays, oldest first"""
+        if not NUMPY_AVAILABLE:
+            return None
+        
+        with self._window_lock:
+            if not self._window_count:
+                return None
+            # Rolling copies the ring with the oldest sample first, whether or
+            # not it has wrapped
+            window = np.roll(self._window, -self._window_pos, axis=1)[:, -self._window_count:]
+        return dict(zip(_WINDOW_KEYS, window))
+    
     def get_average_metrics(self, duration_minutes: int = 5) -> Optional[Dict[str, float]]:
         """Get average metrics over the specified duration"""
         if not self.metrics_history:
@@ -6,6 +6,7 @@ System utilities, logging, and benchmarking tools
 from .logger import setup_logging, get_logger, log_system_info
 from .system import check_system_requirements, optimize_system, get_system_metrics
 from .benchmark import run_benchmarks, MiningBenchmark
+from .scheduler import PollScheduler, get_poll_scheduler
 
 __all__ = [
     "setup_logging",
@@ -15,5 +16,7 @@ __all__ = [
     "optimize_system",
     "get_system_metrics",
     "run_benchmarks",
-    "MiningBenchmark"
+    "MiningBenchmark",
+    "PollScheduler",
+    "get_poll_scheduler"
 ]
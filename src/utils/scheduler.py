@@ -0,0 +1,99 @@
+"""
+Poll Scheduler
+Runs periodic pollers as tasks on one shared asyncio event loop thread
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PollScheduler:
+    """
+    One background thread and event loop shared by every periodic poller
+    
+    Pollers are plain callables run on the loop thread one at a time, so a
+    slow HTTP call delays the next poller instead of stacking another
+    request on top of it. Keep them short and give network calls timeouts.
+    """
+    
+    def __init__(self, name: str = "poll-scheduler"):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def start(self):
+        """Start the event loop thread if it is not already running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run_loop, args=(self._loop,),
+                                            name=self.name, daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Cancel all pollers and stop the event loop thread"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join(timeout=5)
+    
+    def add(self, func: Callable[[], object], interval: float,
+            condition: Optional[Callable[[], bool]] = None) -> Future:
+        """
+        Call func every interval seconds, skipping rounds where condition is false
+        
+        Returns a future whose cancel() removes the poller.
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._poll(func, interval, condition), self._loop)
+    
+    def _run_loop(self, loop: asyncio.AbstractEventLoop):
+        """Thread body: run the loop until stop(), then cancel leftover pollers"""
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+    
+    async def _poll(self, func: Callable[[], object], interval: float,
+                    condition: Optional[Callable[[], bool]]):
+        """Poller task: run func, then sleep for interval"""
+        name = getattr(func, "__qualname__", repr(func))
+        while True:
+            try:
+                if condition is None or condition():
+                    func()
+            except Exception as e:
+                logger.error(f"Poller {name} error: {e}")
+            await asyncio.sleep(interval)
+
+
+_poll_scheduler = None
+_poll_scheduler_lock = threading.Lock()
+
+
+def get_poll_scheduler() -> PollScheduler:
+    """Get the process-wide poll scheduler, creating it on first use"""
+    global _poll_scheduler
+    with _poll_scheduler_lock:
+        if _poll_scheduler is None:
+            _poll_scheduler = PollScheduler()
+        return _poll_scheduler
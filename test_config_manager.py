@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for configuration file saving
+"""
+
+import os
+import stat
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from config.manager import ConfigManager
+
+
+def test_save_keeps_private_mode():
+    """Saving over a 0600 config must not widen its permissions"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "production.conf")
+        Path(path).write_text("[mining]\ndefault_algorithm = sha256\n")
+        os.chmod(path, 0o600)
+        
+        config_manager = ConfigManager(path)
+        config_manager.load_config()
+        config_manager.config.pool_password = "secret"
+        assert config_manager.save_config()
+        
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert "secret" in Path(path).read_text()
+        assert os.listdir(tmp_dir) == ["production.conf"]
+
+
+def test_concurrent_saves_do_not_collide():
+    """Threads saving the same file each use their own temp file"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "default.json")
+        errors = []
+        
+        def save(index):
+            config_manager = ConfigManager(path)
+            for attempt in range(20):
+                config_manager.config.cpu_threads = index * 100 + attempt
+                if not config_manager.save_config():
+                    errors.append(index)
+        
+        threads = [threading.Thread(target=save, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert not errors
+        assert os.listdir(tmp_dir) == ["default.json"]
+        assert ConfigManager(path).load_config()["mining"]["cpu_threads"] % 100 == 19
+
+
+def test_missing_file_in_unwritable_location_returns_defaults():
+    """A default config that cannot be created is returned, not raised"""
+    with tempfile.NamedTemporaryFile() as not_a_dir:
+        config = ConfigManager(os.path.join(not_a_dir.name, "x.json")).load_config()
+        assert config["mining"]["default_algorithm"] == "sha256"
+
+
+if __name__ == "__main__":
+    test_save_keeps_private_mode()
+    test_concurrent_saves_do_not_collide()
+    test_missing_file_in_unwritable_location_returns_defaults()
+    print("✅ Config save keeps file permissions")